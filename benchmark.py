@@ -0,0 +1,361 @@
+"""
+Benchmark do backend
+====================
+
+Mede latência (p50/p95/p99) e vazão (requisições por segundo) dos endpoints
+da API, de forma reproduzível:
+
+1. Cria um banco temporário e o popula com `--eventos` eventos (1k a 1M).
+2. Executa cada cenário (listagem, busca por id, criação, atualização,
+   remoção, calendário, importação e reimportação do mesmo lote...) com `--clientes` clientes concorrentes:
+   - alvo "asgi": cliente ASGI do httpx no mesmo processo do app (sem rede),
+     em um subprocesso por modo de banco;
+   - alvo "uvicorn": servidor uvicorn local, um por modo de banco, com
+     `--workers` processos (para medir o ganho com vários núcleos).
+3. Salva os resultados em JSON (`--saida`) e, com `--comparar`, aponta as
+   regressões em relação a um resultado anterior.
+
+Uso:
+    python benchmark.py --eventos 100000 --clientes 50 --requisicoes 2000
+    python benchmark.py --eventos 100000 --comparar resultados_anteriores.json
+    python benchmark.py --alvos uvicorn --workers 1 4
+
+Com EVENTOS_DATABASE_URL apontando para um banco servidor (ex.: um PostgreSQL
+local descartável), o banco é populado uma vez e compartilhado por todas as
+execuções, em vez de copiado para cada uma.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+PASTA_PROJETO = os.path.dirname(os.path.abspath(__file__))
+INICIO_DADOS = datetime(2024, 1, 1, 8, 0)
+TAMANHO_LOTE_IMPORTACAO = 1000
+
+
+# Cenários: nome -> (método, função que gera (rota, corpo), fração das requisições)
+def _cenarios(total_eventos):
+    aleatorio = random.Random(42)
+    dias = max(1, total_eventos // 24)
+
+    def data_aleatoria():
+        return (INICIO_DADOS + timedelta(hours=aleatorio.randrange(dias * 24))).isoformat()
+
+    def id_aleatorio():
+        return aleatorio.randint(1, total_eventos)
+
+    def mes_aleatorio():
+        data = INICIO_DADOS + timedelta(days=aleatorio.randrange(dias))
+        return data.year, data.month
+
+    def listar_periodo():
+        ano, mes = mes_aleatorio()
+        fim = f"{ano + 1}-01-01" if mes == 12 else f"{ano}-{mes + 1:02d}-01"
+        return f"/eventos/?inicio={ano}-{mes:02d}-01&fim={fim}&limite=100", None
+
+    def calendario():
+        ano, mes = mes_aleatorio()
+        return f"/calendario/{ano}/{mes}", None
+
+    def lote_novo():
+        return [
+            {"nome": f"Importado {aleatorio.random():.8f}", "data_hora": data_aleatoria()}
+            for _ in range(TAMANHO_LOTE_IMPORTACAO)
+        ]
+
+    # Sempre o mesmo lote: só a primeira requisição insere, as demais medem o
+    # caminho idempotente (tudo já existe, nenhuma escrita)
+    lote_repetido = lote_novo()
+
+    def lote():
+        return "/eventos/lote", lote_novo()
+
+    # Remoção dos eventos semeados, do maior id para o menor: cada id é
+    # deletado uma vez; esgotados (ou já apagados numa execução anterior
+    # contra o mesmo banco), as requisições restantes recebem 404
+    ids_para_deletar = iter(range(total_eventos, 0, -1))
+
+    def deletar():
+        return f"/eventos/{next(ids_para_deletar, 0)}", None
+
+    return {
+        "listar": ("GET", lambda: ("/eventos/?limite=100", None), 1.0),
+        "listar_periodo": ("GET", listar_periodo, 1.0),
+        "obter": ("GET", lambda: (f"/eventos/{id_aleatorio()}", None), 1.0),
+        "calendario": ("GET", calendario, 1.0),
+        # Nomes distintos: (nome, data_hora) repetido é recusado com 409
+        "criar": ("POST", lambda: ("/eventos/", {"nome": f"Benchmark {aleatorio.random():.8f}",
+                                                 "data_hora": data_aleatoria()}), 0.5),
+        "atualizar": ("PUT", lambda: (f"/eventos/{id_aleatorio()}", {"nome": f"Atualizado {aleatorio.random():.8f}"}), 0.5),
+        "deletar": ("DELETE", deletar, 0.5),
+        "lote": ("POST", lote, 0.01),
+        # Caminho usado pelo frontend e pelo sync do gerenciador_eventos.py
+        "importar": ("POST", lambda: ("/eventos/importar", {"eventos": lote_novo()}), 0.01),
+        "reimportar": ("POST", lambda: ("/eventos/importar", {"eventos": lote_repetido}), 0.01),
+    }
+
+
+def percentil(valores_ordenados, p):
+    """Percentil pelo método nearest-rank."""
+    indice = max(0, min(len(valores_ordenados) - 1, math.ceil(p / 100 * len(valores_ordenados)) - 1))
+    return valores_ordenados[indice]
+
+
+async def executar_cenario(http, metodo, gerar, requisicoes, clientes):
+    latencias = []
+    erros = 0
+    restantes = requisicoes
+
+    async def cliente():
+        nonlocal restantes, erros
+        while restantes > 0:
+            restantes -= 1
+            rota, corpo = gerar()
+            inicio = time.perf_counter()
+            try:
+                resposta = await http.request(metodo, rota, json=corpo)
+                # 404 é esperado em obter/atualizar/deletar quando o id já foi apagado
+                if resposta.status_code >= 400 and resposta.status_code != 404:
+                    erros += 1
+            except httpx.HTTPError:
+                erros += 1
+            latencias.append((time.perf_counter() - inicio) * 1000)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(min(clientes, requisicoes))))
+    duracao = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        "requisicoes": requisicoes,
+        "erros": erros,
+        "segundos": round(duracao, 3),
+        "req_por_segundo": round(requisicoes / duracao, 1),
+        "latencia_ms": {
+            "media": round(statistics.fmean(latencias), 2),
+            "p50": round(percentil(latencias, 50), 2),
+            "p95": round(percentil(latencias, 95), 2),
+            "p99": round(percentil(latencias, 99), 2),
+            "max": round(latencias[-1], 2),
+        },
+    }
+
+
+async def executar_cenarios(http, args):
+    resultados = {}
+    for nome, (metodo, gerar, fracao) in _cenarios(args.eventos).items():
+        if args.cenarios and nome not in args.cenarios:
+            continue
+        requisicoes = max(1, int(args.requisicoes * fracao))
+        resultados[nome] = await executar_cenario(http, metodo, gerar, requisicoes, args.clientes)
+    return resultados
+
+
+def popular_banco(pasta, total_eventos):
+    """Cria o banco em `pasta` com o esquema do backend e insere os eventos em blocos."""
+    os.chdir(pasta)
+    sys.path.insert(0, PASTA_PROJETO)
+    import backend
+    from sqlalchemy import insert
+
+    backend.inicializar_db()
+    aleatorio = random.Random(7)
+    bloco = 50_000
+    with backend.engine.begin() as conexao:
+        for inicio in range(0, total_eventos, bloco):
+            linhas = []
+            for i in range(inicio, min(inicio + bloco, total_eventos)):
+                nome = f"Evento {i}"
+                data_hora = INICIO_DADOS + timedelta(minutes=aleatorio.randrange(total_eventos * 60))
+                linhas.append({"nome": nome, "data_hora": data_hora, "chave": backend.chave_evento(nome, data_hora)})
+            conexao.execute(insert(backend.Evento), linhas)
+        conexao.execute(backend.incrementar_versao())
+    backend.engine.dispose()
+
+
+def rodar_asgi(pasta, modo, args):
+    """Roda os cenários com o app no mesmo processo (chamado em um subprocesso)."""
+    os.environ["EVENTOS_MODO_DB"] = modo
+    os.chdir(pasta)
+    sys.path.insert(0, PASTA_PROJETO)
+    import backend
+
+    async def principal():
+        # O ASGITransport não envia os eventos de lifespan: o startup (esquema,
+        # índice de busca) e o shutdown (fechar os pools) rodam aqui
+        transporte = httpx.ASGITransport(app=backend.app)
+        async with backend.app.router.lifespan_context(backend.app):
+            async with httpx.AsyncClient(transport=transporte, base_url="http://asgi", timeout=120) as http:
+                return await executar_cenarios(http, args)
+
+    return asyncio.run(principal())
+
+
+def rodar_uvicorn(pasta, modo, workers, args):
+    # O banco já foi criado por popular_banco; os workers não precisam migrar
+    ambiente = {**os.environ, "EVENTOS_MODO_DB": modo, "EVENTOS_INICIALIZAR_DB": "0", "WEB_CONCURRENCY": str(workers)}
+    servidor = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend:app", "--app-dir", PASTA_PROJETO,
+         "--port", str(args.porta), "--workers", str(workers), "--log-level", "warning"],
+        cwd=pasta,
+        env=ambiente,
+    )
+    url = f"http://127.0.0.1:{args.porta}"
+    try:
+        aguardar_servidor(url)
+        limites = httpx.Limits(max_connections=args.clientes, max_keepalive_connections=args.clientes)
+
+        async def principal():
+            async with httpx.AsyncClient(base_url=url, limits=limites, timeout=120) as http:
+                return await executar_cenarios(http, args)
+
+        return asyncio.run(principal())
+    finally:
+        servidor.terminate()
+        servidor.wait()
+
+
+def aguardar_servidor(url, tempo_limite=30):
+    fim = time.monotonic() + tempo_limite
+    while time.monotonic() < fim:
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Servidor não respondeu em {url}")
+
+
+def comparar(resultados, arquivo_base, tolerancia):
+    """Lista as regressões de p95 ou de vazão maiores que `tolerancia` (fração)."""
+    with open(arquivo_base, encoding="utf-8") as arquivo:
+        base = json.load(arquivo)
+    def chave(r):
+        # Resultados anteriores à opção --workers rodaram com 1 worker
+        return r["alvo"], r["modo"], r.get("workers", 1), r["cenario"]
+
+    indice_base = {chave(r): r for r in base["resultados"]}
+    regressoes = []
+    for atual in resultados:
+        anterior = indice_base.get(chave(atual))
+        if not anterior:
+            continue
+        nome = "/".join(str(parte) for parte in chave(atual))
+        p95_antes, p95_agora = anterior["latencia_ms"]["p95"], atual["latencia_ms"]["p95"]
+        vazao_antes, vazao_agora = anterior["req_por_segundo"], atual["req_por_segundo"]
+        if p95_antes and p95_agora > p95_antes * (1 + tolerancia):
+            regressoes.append(f"{nome}: p95 {p95_antes} ms -> {p95_agora} ms")
+        if vazao_agora < vazao_antes * (1 - tolerancia):
+            regressoes.append(f"{nome}: vazão {vazao_antes} -> {vazao_agora} req/s")
+    return regressoes
+
+
+def imprimir(resultados):
+    print(f"{'alvo':<8} {'modo':<6} {'workers':>7} {'cenário':<15} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'erros':>6}")
+    for r in resultados:
+        lat = r["latencia_ms"]
+        print(f"{r['alvo']:<8} {r['modo']:<6} {r['workers']:>7} {r['cenario']:<15} {r['req_por_segundo']:>9} "
+              f"{lat['p50']:>9} {lat['p95']:>9} {lat['p99']:>9} {r['erros']:>6}")
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Benchmark de latência e vazão do backend de eventos")
+    parser.add_argument("--eventos", type=int, default=10_000, help="Eventos no banco (ex.: 1000 a 1000000)")
+    parser.add_argument("--clientes", type=int, default=50, help="Clientes concorrentes")
+    parser.add_argument("--requisicoes", type=int, default=1000, help="Requisições por cenário de leitura")
+    parser.add_argument("--alvos", nargs="+", choices=["asgi", "uvicorn"], default=["asgi", "uvicorn"])
+    parser.add_argument("--modos", nargs="+", choices=["sync", "async"], default=["sync", "async"])
+    parser.add_argument("--cenarios", nargs="+", help="Executa só estes cenários")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1],
+                        help="Processos do uvicorn (ex.: 1 4 para comparar a vazão)")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--saida", default="benchmark_resultados.json")
+    parser.add_argument("--comparar", help="Arquivo JSON de um resultado anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Piora aceitável (0.2 = 20%%)")
+    parser.add_argument("--interno-asgi", nargs=2, metavar=("PASTA", "MODO"), help=argparse.SUPPRESS)
+    return parser
+
+
+def main():
+    args = criar_parser().parse_args()
+
+    if args.interno_asgi:
+        pasta, modo = args.interno_asgi
+        print(json.dumps(rodar_asgi(pasta, modo, args)))
+        return
+
+    resultados = []
+    with tempfile.TemporaryDirectory(prefix="benchmark_eventos_") as pasta:
+        print(f"⏳ Populando banco temporário com {args.eventos} eventos...")
+        subprocess.run(
+            [sys.executable, "-c", f"import benchmark; benchmark.popular_banco({pasta!r}, {args.eventos})"],
+            cwd=PASTA_PROJETO, check=True,
+        )
+        # Cada execução parte de uma cópia do banco populado, para que as
+        # escritas de uma execução não afetem a próxima (um banco servidor é
+        # compartilhado por todas)
+        original = os.path.join(pasta, "eventos.db")
+        banco_servidor = not os.getenv("EVENTOS_DATABASE_URL", "sqlite").startswith("sqlite")
+        execucoes = [
+            (alvo, modo, workers)
+            for alvo in args.alvos
+            for modo in args.modos
+            for workers in ([1] if alvo == "asgi" else args.workers)
+        ]
+        for alvo, modo, workers in execucoes:
+            execucao = os.path.join(pasta, f"{alvo}_{modo}_{workers}")
+            os.makedirs(execucao)
+            if not banco_servidor:
+                shutil.copyfile(original, os.path.join(execucao, "eventos.db"))
+            print(f"🚀 {alvo} / {modo} / {workers} worker(s)...")
+            if alvo == "asgi":
+                processo = subprocess.run(
+                    [sys.executable, __file__, *sys.argv[1:], "--interno-asgi", execucao, modo],
+                    check=True, capture_output=True, text=True,
+                )
+                por_cenario = json.loads(processo.stdout.strip().splitlines()[-1])
+            else:
+                por_cenario = rodar_uvicorn(execucao, modo, workers, args)
+            for cenario, resultado in por_cenario.items():
+                resultados.append({"alvo": alvo, "modo": modo, "workers": workers, "cenario": cenario, **resultado})
+
+    imprimir(resultados)
+    relatorio = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": {
+            "eventos": args.eventos, "clientes": args.clientes, "requisicoes": args.requisicoes,
+            "workers": args.workers,
+        },
+        "resultados": resultados,
+    }
+    with open(args.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+    print(f"💾 Resultados salvos em {args.saida}")
+
+    if args.comparar:
+        regressoes = comparar(resultados, args.comparar, args.tolerancia)
+        for regressao in regressoes:
+            print(f"⚠️  Regressão: {regressao}")
+        if regressoes:
+            sys.exit(1)
+        print("✅ Nenhuma regressão acima da tolerância.")
+
+
+if __name__ == "__main__":
+    main()
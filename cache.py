@@ -0,0 +1,171 @@
+"""
+Cache de respostas da API
+=========================
+
+Guarda respostas já serializadas (bytes JSON) para que leituras repetidas não
+precisem consultar o banco nem passar de novo pelo Pydantic.
+
+- BackendCache: interface do armazenamento; outra implementação (ex.: Redis)
+  permite compartilhar o cache entre vários workers do uvicorn.
+- CacheMemoria: backend em memória do processo, com expiração (TTL) e
+  descarte do item usado há mais tempo (LRU).
+- CacheRespostas: camada read-through com invalidação e métricas.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class BackendCache(ABC):
+    """Interface dos backends de cache; um backend incompleto falha ao ser criado."""
+
+    @abstractmethod
+    def obter(self, chave):
+        """Retorna o valor guardado ou None se não existir ou tiver expirado."""
+
+    @abstractmethod
+    def definir(self, chave, valor, ttl):
+        pass
+
+    @abstractmethod
+    def remover(self, chave):
+        pass
+
+    @abstractmethod
+    def remover_prefixo(self, prefixo):
+        pass
+
+    @abstractmethod
+    def limpar(self):
+        pass
+
+    @abstractmethod
+    def tamanho(self):
+        pass
+
+
+class CacheMemoria(BackendCache):
+    """Cache LRU em memória com TTL, seguro para uso entre threads."""
+
+    def __init__(self, max_itens=1024):
+        self.max_itens = max_itens
+        self._itens = OrderedDict()  # chave -> (expira_em, valor)
+        self._lock = threading.Lock()
+
+    def obter(self, chave):
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            expira_em, valor = item
+            if expira_em < time.monotonic():
+                del self._itens[chave]
+                return None
+            self._itens.move_to_end(chave)
+            return valor
+
+    def definir(self, chave, valor, ttl):
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + ttl, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def remover(self, chave):
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def remover_prefixo(self, prefixo):
+        with self._lock:
+            for chave in [chave for chave in self._itens if chave.startswith(prefixo)]:
+                del self._itens[chave]
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+
+    def tamanho(self):
+        return len(self._itens)
+
+
+class CacheRespostas:
+    """
+    Cache read-through: obter_ou_calcular() devolve o valor guardado ou calcula,
+    guarda e devolve. Valores None não são guardados.
+
+    Cada invalidação incrementa uma geração; um valor calculado enquanto uma
+    escrita acontecia (geração diferente da do início) não é guardado, para que
+    uma leitura concorrente não grave dados antigos depois da invalidação.
+    """
+
+    def __init__(self, backend, ttl):
+        self.backend = backend
+        self.ttl = ttl
+        self.acertos = 0
+        self.falhas = 0
+        self.invalidacoes = 0
+        self._geracao = 0
+        self._lock = threading.Lock()
+
+    @property
+    def ativo(self):
+        return self.ttl > 0
+
+    def _contar(self, acerto):
+        with self._lock:
+            if acerto:
+                self.acertos += 1
+            else:
+                self.falhas += 1
+
+    def _guardar(self, chave, valor, geracao):
+        if valor is not None and geracao == self._geracao:
+            self.backend.definir(chave, valor, self.ttl)
+
+    def obter_ou_calcular(self, chave, calcular):
+        if not self.ativo:
+            return calcular()
+        valor = self.backend.obter(chave)
+        self._contar(valor is not None)
+        if valor is not None:
+            return valor
+        geracao = self._geracao
+        valor = calcular()
+        self._guardar(chave, valor, geracao)
+        return valor
+
+    async def obter_ou_calcular_async(self, chave, calcular):
+        """Igual a obter_ou_calcular(), mas `calcular` é uma função async."""
+        if not self.ativo:
+            return await calcular()
+        valor = self.backend.obter(chave)
+        self._contar(valor is not None)
+        if valor is not None:
+            return valor
+        geracao = self._geracao
+        valor = await calcular()
+        self._guardar(chave, valor, geracao)
+        return valor
+
+    def invalidar(self, *chaves, prefixos=()):
+        with self._lock:
+            self._geracao += 1
+            self.invalidacoes += 1
+        for chave in chaves:
+            self.backend.remover(chave)
+        for prefixo in prefixos:
+            self.backend.remover_prefixo(prefixo)
+
+    def metricas(self):
+        consultas = self.acertos + self.falhas
+        return {
+            "ativo": self.ativo,
+            "ttl_segundos": self.ttl,
+            "itens": self.backend.tamanho(),
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acerto": round(self.acertos / consultas, 4) if consultas else None,
+            "invalidacoes": self.invalidacoes,
+        }
@@ -0,0 +1,206 @@
+"""
+Cliente HTTP da API de eventos
+==============================
+
+Usado pelo frontend no lugar de chamadas soltas a requests.get/post/...:
+
+- Uma única requests.Session com pool de conexões (keep-alive), em vez de
+  abrir uma conexão TCP nova a cada chamada.
+- Novas tentativas com espera exponencial (backoff) em falhas de conexão e
+  em respostas 502/503/504; POST só é repetido se a conexão nem chegou a ser
+  aberta, para não duplicar eventos.
+- GET condicional (If-None-Match) com os dados guardados pelo chamador
+  (RespostasRecentes limita quantas respostas ficam guardadas).
+- enviar_em_paralelo(): várias requisições ao mesmo tempo, com um limite de
+  requisições em andamento (ThreadPoolExecutor).
+- acompanhar_mudancas(): lê o stream SSE de mudanças (/eventos/stream),
+  reconectando com Last-Event-ID quando a conexão cai.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+TIMEOUT_PADRAO = 5
+MAX_PARALELO_PADRAO = 4
+# Sem nenhuma mensagem (nem o ping do servidor) por este tempo, o stream é dado como perdido
+TIMEOUT_LEITURA_STREAM = 60
+
+
+class RespostasRecentes:
+    """
+    Respostas guardadas para o GET condicional, descartando a usada há mais
+    tempo (LRU) acima de `max_itens`. Segura entre threads, para ser
+    compartilhada por várias sessões.
+    """
+
+    def __init__(self, max_itens=256):
+        self.max_itens = max_itens
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave, padrao=None):
+        with self._lock:
+            valor = self._itens.get(chave)
+            if valor is None:
+                return padrao
+            self._itens.move_to_end(chave)
+            return valor
+
+    def __setitem__(self, chave, valor):
+        with self._lock:
+            self._itens[chave] = valor
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def __len__(self):
+        return len(self._itens)
+
+
+def ler_sse(linhas):
+    """Converte as linhas de um stream Server-Sent Events em dicionários {"id", "tipo", "dados"}."""
+    mensagem = {}
+    dados = []
+    for linha in linhas:
+        if not linha:
+            if dados:
+                yield {"id": mensagem.get("id"), "tipo": mensagem.get("event", "message"), "dados": json.loads("\n".join(dados))}
+            elif "retry" in mensagem:
+                yield {"id": None, "tipo": "retry", "dados": mensagem["retry"]}
+            mensagem, dados = {}, []
+            continue
+        if linha.startswith(":"):
+            continue  # comentário (ping)
+        campo, _, valor = linha.partition(":")
+        valor = valor[1:] if valor.startswith(" ") else valor
+        if campo == "data":
+            dados.append(valor)
+        else:
+            mensagem[campo] = valor
+
+
+class ClienteApi:
+    def __init__(self, url_base, tentativas=3, backoff=0.3, conexoes=10, timeout=TIMEOUT_PADRAO):
+        self.url_base = url_base.rstrip("/")
+        self.timeout = timeout
+        self.sessao = requests.Session()
+        # Métodos padrão do Retry: GET, PUT, DELETE... (POST fica de fora, exceto
+        # em erros de conexão, que acontecem antes de a requisição ser enviada)
+        retry = Retry(
+            total=tentativas,
+            backoff_factor=backoff,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False,
+        )
+        adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=conexoes, max_retries=retry)
+        self.sessao.mount("http://", adaptador)
+        self.sessao.mount("https://", adaptador)
+
+    def url(self, caminho):
+        return f"{self.url_base}{caminho}"
+
+    def requisitar(self, metodo, caminho, timeout=None, **kwargs):
+        return self.sessao.request(metodo, self.url(caminho), timeout=timeout or self.timeout, **kwargs)
+
+    def get(self, caminho, **kwargs):
+        return self.requisitar("GET", caminho, **kwargs)
+
+    def post(self, caminho, **kwargs):
+        return self.requisitar("POST", caminho, **kwargs)
+
+    def put(self, caminho, **kwargs):
+        return self.requisitar("PUT", caminho, **kwargs)
+
+    def delete(self, caminho, **kwargs):
+        return self.requisitar("DELETE", caminho, **kwargs)
+
+    def get_condicional(self, caminho, params=None, respostas=None):
+        """
+        GET que reenvia o ETag da resposta anterior (If-None-Match). Se a API
+        responder 304, os dados guardados em `respostas` são reaproveitados sem
+        baixar o corpo de novo. Retorna (dados, cabeçalhos).
+
+        `respostas` é um dicionário (ou RespostasRecentes) do chamador, já que
+        o cliente é compartilhado entre sessões.
+        """
+        respostas = {} if respostas is None else respostas
+        chave = f"{caminho}?{urlencode(sorted((params or {}).items()))}"
+        anterior = respostas.get(chave)
+        cabecalhos = {"If-None-Match": anterior["etag"]} if anterior else {}
+
+        response = self.get(caminho, params=params, headers=cabecalhos)
+        if response.status_code == 304 and anterior:
+            return anterior["dados"], anterior["cabecalhos"]
+        response.raise_for_status()
+
+        dados = response.json()
+        if "ETag" in response.headers:
+            respostas[chave] = {"etag": response.headers["ETag"], "dados": dados, "cabecalhos": response.headers.copy()}
+        return dados, response.headers
+
+    def enviar_em_paralelo(self, metodo, caminho, corpos, max_paralelo=MAX_PARALELO_PADRAO, timeout=None):
+        """
+        Envia cada corpo JSON de `corpos` (um iterável, lido aos poucos) com no
+        máximo `max_paralelo` requisições em andamento.
+
+        Gera tuplas (corpo, response, erro) na ordem em que terminam; `erro` é
+        a exceção de conexão, quando houver (e então `response` é None).
+        """
+        corpos = iter(corpos)
+        with ThreadPoolExecutor(max_workers=max_paralelo) as executor:
+            pendentes = {}
+
+            def enviar_proximo():
+                corpo = next(corpos, None)
+                if corpo is None:
+                    return False
+                futuro = executor.submit(self.requisitar, metodo, caminho, json=corpo, timeout=timeout)
+                pendentes[futuro] = corpo
+                return True
+
+            while len(pendentes) < max_paralelo and enviar_proximo():
+                pass
+            while pendentes:
+                concluidos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+                for futuro in concluidos:
+                    corpo = pendentes.pop(futuro)
+                    try:
+                        resultado = (corpo, futuro.result(), None)
+                    except requests.exceptions.RequestException as e:
+                        resultado = (corpo, None, e)
+                    enviar_proximo()
+                    yield resultado
+
+    def acompanhar_mudancas(self, caminho="/eventos/stream", ultimo_id=None, espera=3):
+        """
+        Gera as mudanças do stream SSE ({"id", "tipo", "dados"}) indefinidamente.
+        Se a conexão cair, espera `espera` segundos (ou o `retry` do servidor) e
+        reconecta enviando o último id recebido, para não perder mudanças.
+        """
+        while True:
+            cabecalhos = {"Accept": "text/event-stream"}
+            if ultimo_id is not None:
+                cabecalhos["Last-Event-ID"] = str(ultimo_id)
+            try:
+                with self.sessao.get(
+                    self.url(caminho), headers=cabecalhos, stream=True,
+                    timeout=(self.timeout, TIMEOUT_LEITURA_STREAM),
+                ) as response:
+                    response.raise_for_status()
+                    for mensagem in ler_sse(response.iter_lines(decode_unicode=True)):
+                        if mensagem["tipo"] == "retry":
+                            espera = int(mensagem["dados"]) / 1000
+                            continue
+                        ultimo_id = mensagem["id"]
+                        yield mensagem
+            except (requests.exceptions.RequestException, ValueError):
+                pass
+            time.sleep(espera)
@@ -0,0 +1,135 @@
+"""
+Difusão de mudanças
+===================
+
+Pub/sub em memória do processo que alimenta o stream /eventos/stream (SSE):
+
+- Cada escrita confirmada publica uma mudança (criar, atualizar ou deletar)
+  com um id crescente, prefixado pela época do processo ("<época>-<n>").
+- As últimas mudanças ficam num buffer circular, para que um cliente que
+  reconecte com Last-Event-ID receba o que perdeu.
+- Cada assinante tem uma fila asyncio própria; a publicação pode vir de
+  qualquer thread (os endpoints síncronos rodam no threadpool) e é entregue
+  no event loop do assinante com call_soon_threadsafe.
+
+Um assinante lento demais é desconectado em vez de acumular mudanças sem
+limite; ele reconecta e recupera o que faltou pelo buffer.
+
+Como o cache de respostas, o difusor é por processo: com vários workers do
+uvicorn, cada stream só vê as mudanças feitas no seu worker. A época (nova a
+cada processo) impede que um id recebido de outro worker, ou de antes de um
+reinício, seja confundido com um id local: ele pede um "recarregar".
+"""
+
+import asyncio
+import secrets
+import threading
+from collections import deque
+
+# Mudanças guardadas para reenvio a quem reconecta
+CAPACIDADE_PADRAO = 1000
+# Mudanças pendentes por assinante antes de desconectá-lo
+MAX_PENDENTES_PADRAO = 1000
+
+
+class Mudanca:
+    __slots__ = ("id", "acao", "dados")
+
+    def __init__(self, id, acao, dados):
+        self.id = id
+        self.acao = acao
+        self.dados = dados
+
+
+class Assinatura:
+    """Fila de um cliente do stream e as mudanças a reenviar ao conectar."""
+
+    def __init__(self, loop, pendentes, perdeu):
+        self.loop = loop
+        self.fila = asyncio.Queue()
+        self.pendentes = pendentes
+        # O cliente pediu um id que já saiu do buffer (ou de outro processo):
+        # ele precisa recarregar tudo antes de seguir com as mudanças
+        self.perdeu = perdeu
+        self.ativa = True
+
+    async def proxima(self):
+        """Próxima mudança, ou None se o assinante foi desconectado por atraso."""
+        return await self.fila.get()
+
+
+class Difusor:
+    def __init__(self, capacidade=CAPACIDADE_PADRAO, max_pendentes=MAX_PENDENTES_PADRAO):
+        self.max_pendentes = max_pendentes
+        self.epoca = secrets.token_hex(4)
+        self.ultimo_id = 0
+        self.descartados = 0
+        self._buffer = deque(maxlen=capacidade)
+        self._assinaturas = set()
+        self._lock = threading.Lock()
+
+    def id_externo(self, numero):
+        """Id de uma mudança como vai para o cliente (campo id do SSE)."""
+        return f"{self.epoca}-{numero}"
+
+    def _numero(self, id_externo):
+        """Número local de um id recebido do cliente, ou None se ele não for deste processo."""
+        epoca, _, numero = str(id_externo).partition("-")
+        if epoca != self.epoca or not numero.isdigit():
+            return None
+        return int(numero)
+
+    def publicar(self, acao, dados):
+        """Registra uma mudança e a entrega a todos os assinantes (de qualquer thread)."""
+        with self._lock:
+            self.ultimo_id += 1
+            mudanca = Mudanca(self.ultimo_id, acao, dados)
+            self._buffer.append(mudanca)
+            # Ainda dentro do lock: a ordem de entrega segue a ordem dos ids
+            for assinatura in list(self._assinaturas):
+                try:
+                    assinatura.loop.call_soon_threadsafe(self._entregar, assinatura, mudanca)
+                except RuntimeError:
+                    # Event loop já encerrado
+                    self._assinaturas.discard(assinatura)
+        return mudanca
+
+    def _entregar(self, assinatura, mudanca):
+        # Roda no event loop do assinante
+        if not assinatura.ativa:
+            return
+        if assinatura.fila.qsize() >= self.max_pendentes:
+            self.descartados += 1
+            self.cancelar(assinatura)
+            assinatura.fila.put_nowait(None)
+            return
+        assinatura.fila.put_nowait(mudanca)
+
+    def assinar(self, ultimo_id=None):
+        """Cria uma assinatura; com `ultimo_id` (de id_externo), reenvia as mudanças
+        posteriores a ele. Um id de outro processo marca a assinatura como `perdeu`.
+
+        Precisa ser chamada dentro do event loop que vai consumir a fila.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pendentes = []
+            perdeu = False
+            if ultimo_id is not None:
+                numero = self._numero(ultimo_id)
+                mais_antigo = self._buffer[0].id if self._buffer else self.ultimo_id + 1
+                perdeu = numero is None or numero > self.ultimo_id or numero + 1 < mais_antigo
+                if not perdeu:
+                    pendentes = [mudanca for mudanca in self._buffer if mudanca.id > numero]
+            assinatura = Assinatura(loop, pendentes, perdeu)
+            self._assinaturas.add(assinatura)
+        return assinatura
+
+    def cancelar(self, assinatura):
+        with self._lock:
+            assinatura.ativa = False
+            self._assinaturas.discard(assinatura)
+
+    def assinantes(self):
+        with self._lock:
+            return len(self._assinaturas)
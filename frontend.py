@@ -2,17 +2,188 @@ import streamlit as st
 import requests
 import calendar
 import json
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime
+from itertools import islice
+from zoneinfo import ZoneInfo
+
+from cliente_api import ClienteApi, RespostasRecentes
+from importacao import e_cabecalho_snapshot, em_lotes, iterar_eventos
 
 st.set_page_config(page_title="Gerenciador de Eventos", page_icon="📅", layout="wide")
 
 API_URL = "http://127.0.0.1:8000"
+TAMANHO_LOTE_IMPORTACAO = 1000
+TAMANHO_PREVIA_IMPORTACAO = 20
+# Lotes de importação enviados ao mesmo tempo
+LOTES_PARALELOS_IMPORTACAO = 4
+# Por quanto tempo (s) os dados lidos da API são reaproveitados entre reruns.
+# As mudanças chegam pelo stream (/eventos/stream) e limpam o cache na hora;
+# o TTL só cobre o tempo em que o stream estiver desconectado
+TTL_DADOS = 120
+# De quanto em quanto tempo (s) a página confere se chegaram mudanças pelo stream
+INTERVALO_AO_VIVO = 2
+# Respostas (com ETag) guardadas para revalidação, somando todas as sessões
+MAX_RESPOSTAS_HTTP = 200
+# Fuso usado pela API para calcular a semana/mês atual e os eventos futuros/passados
+FUSO_HORARIO = "America/Sao_Paulo"
+# Filtros da listagem -> parâmetro `periodo` da API
+PERIODOS_LISTAGEM = {
+    "Todos": None,
+    "Esta Semana": "semana",
+    "Este Mês": "mes",
+    "Próximos": "futuros",
+    "Passados": "passados",
+}
+# Opções de repetição do formulário -> frequência das séries da API (/series)
+REPETICOES = {
+    "Não repetir": None,
+    "Diariamente": "diaria",
+    "Semanalmente": "semanal",
+    "Mensalmente": "mensal",
+}
+
+
+@st.cache_resource
+def obter_cliente():
+    """Cliente HTTP (pool de conexões) compartilhado entre as execuções do script e as sessões."""
+    return ClienteApi(API_URL, conexoes=LOTES_PARALELOS_IMPORTACAO * 2)
+
+
+cliente = obter_cliente()
+
+
+def itens_arquivo(arquivo):
+    """Itens do arquivo enviado, sem o cabeçalho do snapshot do gerenciador_eventos.py."""
+    return (item for item in iterar_eventos(arquivo) if not e_cabecalho_snapshot(item))
+
+
+def agora_local():
+    """Data/hora atual no FUSO_HORARIO, sem fuso como as datas dos eventos: os
+    rótulos PASSADO/FUTURO seguem o mesmo relógio dos filtros de período da API."""
+    return datetime.now(ZoneInfo(FUSO_HORARIO)).replace(tzinfo=None)
+
+
+@st.cache_resource
+def respostas_http():
+    """ETags e dados das últimas respostas, usados para revalidar quando o cache expira.
+    Compartilhado entre as sessões, então é limitado (LRU) em vez de crescer
+    com cada cursor, busca e mês visitados."""
+    return RespostasRecentes(MAX_RESPOSTAS_HTTP)
+
+
+def get_condicional(caminho, params=None):
+    return cliente.get_condicional(caminho, params, respostas_http())
+
+
+# Camada de dados: cada consulta é feita uma vez e reaproveitada por todas as
+# abas e reruns até o TTL expirar ou até limpar_dados() após uma escrita.
+@st.cache_data(ttl=TTL_DADOS, show_spinner=False)
+def buscar_pagina(limite, cursor=None, periodo=None):
+    """
+    Busca uma página da listagem (paginação por cursor da API), já filtrada
+    pelo período no servidor. Retorna (eventos, cursor da próxima página ou
+    None). A data_hora de cada evento é convertida em datetime aqui, uma única vez.
+    """
+    params = {"limite": limite, "cursor": cursor, "periodo": periodo, "tz": FUSO_HORARIO if periodo else None}
+    params = {chave: valor for chave, valor in params.items() if valor is not None}
+    pagina, cabecalhos = get_condicional("/eventos/", params)
+    eventos = [{**evento, "data_hora": datetime.fromisoformat(evento["data_hora"])} for evento in pagina]
+    return eventos, cabecalhos.get("X-Proximo-Cursor")
+
+
+@st.cache_data(ttl=TTL_DADOS, show_spinner=False)
+def buscar_total(periodo=None):
+    """Total de eventos do período (COUNT feito pela API)."""
+    params = {"periodo": periodo, "tz": FUSO_HORARIO} if periodo else None
+    contagem, _ = get_condicional("/eventos/contagem", params)
+    return contagem["total"]
+
+
+@st.cache_data(ttl=TTL_DADOS, show_spinner=False)
+def buscar_por_nome(termos):
+    """Eventos cujo nome contém as palavras buscadas, do mais relevante ao menos."""
+    resultados, _ = get_condicional("/eventos/busca", {"q": termos})
+    return [{**evento, "data_hora": datetime.fromisoformat(evento["data_hora"])} for evento in resultados]
+
+
+@st.cache_data(ttl=TTL_DADOS, show_spinner=False)
+def buscar_calendario_mes(ano, mes):
+    """Eventos do mês agrupados por dia ({dia: {"total", "eventos"}})."""
+    calendario_mes, _ = get_condicional(f"/calendario/{ano}/{mes}")
+    return {dia["dia"]: dia for dia in calendario_mes["dias"]}
+
+
+def limpar_dados():
+    """Descarta os dados em cache; chamada depois de criar, editar, deletar ou importar."""
+    buscar_pagina.clear()
+    buscar_total.clear()
+    buscar_por_nome.clear()
+    buscar_calendario_mes.clear()
+
+
+@st.cache_resource
+def observar_mudancas():
+    """
+    Thread única (por processo do Streamlit) que acompanha o stream de
+    mudanças da API e descarta os dados em cache a cada criação, edição ou
+    remoção feita por qualquer usuário ou pelo gerenciador_eventos.py.
+    As páginas são filtradas e paginadas no servidor, então em vez de aplicar
+    cada mudança localmente elas são buscadas de novo no próximo rerun.
+    """
+    estado = {"mudancas": 0}
+
+    def acompanhar():
+        for _mudanca in cliente.acompanhar_mudancas():
+            limpar_dados()
+            estado["mudancas"] += 1
+
+    threading.Thread(target=acompanhar, name="observador-mudancas", daemon=True).start()
+    return estado
+
+
+@st.fragment(run_every=INTERVALO_AO_VIVO)
+def atualizar_ao_vivo():
+    """Recarrega a página quando chegam mudanças novas pelo stream."""
+    mudancas = observar_mudancas()["mudancas"]
+    vistas = st.session_state.setdefault("mudancas_vistas", mudancas)
+    if mudancas != vistas:
+        st.session_state.mudancas_vistas = mudancas
+        st.rerun()
+    st.caption("🟢 Atualização ao vivo")
+
+
+def iniciar_edicao(evento):
+    st.session_state.edit_id = evento["id"]
+    st.session_state.edit_nome = evento["nome"]
+    st.session_state.edit_data = evento["data_hora"].date()
+    st.session_state.edit_hora = evento["data_hora"].time()
+    st.rerun()
+
+
+def deletar_evento(evento):
+    """Deleta o evento; numa ocorrência de evento recorrente, deleta a série inteira."""
+    serie_id = evento.get("serie_id")
+    caminho = f"/series/{serie_id}" if serie_id else f"/eventos/{evento['id']}"
+    try:
+        del_response = cliente.delete(caminho)
+        if del_response.status_code == 204:
+            limpar_dados()
+            st.success("✅ Série deletada!" if serie_id else "✅ Evento deletado!")
+            st.rerun()
+        else:
+            detalhe = del_response.text if del_response.text else del_response.status_code
+            st.error(f"❌ Erro ao deletar evento: {detalhe}")
+    except requests.exceptions.RequestException as e:
+        st.error(f"❌ Erro de conexão: {e}")
+
 
 st.title("📅 Gerenciador de Eventos")
+atualizar_ao_vivo()
 st.markdown("---")
 
 # Abas
-tab1, tab2, tab3, tab4 = st.tabs(["➕ Novo Evento", "📋 Listagem", "🗓️ Calendário", "📥 Importar"])
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["➕ Novo Evento", "📋 Listagem", "🗓️ Calendário", "📥 Importar", "🔎 Buscar"])
 
 # TAB 1: Novo Evento
 with tab1:
@@ -22,17 +193,29 @@ with tab1:
         nome = st.text_input("Nome do Evento", placeholder="Ex: Reunião com cliente")
         data = st.date_input("Data")
         hora = st.time_input("Hora")
+        col_rep1, col_rep2, col_rep3 = st.columns(3)
+        with col_rep1:
+            repeticao = st.selectbox("Repetir", list(REPETICOES))
+        with col_rep2:
+            intervalo = st.number_input("A cada (dias/semanas/meses)", min_value=1, max_value=1000, value=1)
+        with col_rep3:
+            ocorrencias = st.number_input("Ocorrências", min_value=2, max_value=10000, value=10)
         
         if st.form_submit_button("💾 Salvar Evento", type="primary"):
             if nome:
                 data_hora = datetime.combine(data, hora).isoformat()
+                frequencia = REPETICOES[repeticao]
                 try:
-                    response = requests.post(
-                        f"{API_URL}/eventos/",
-                        json={"nome": nome, "data_hora": data_hora},
-                        timeout=5
-                    )
+                    if frequencia:
+                        # Evento recorrente: uma única série; a API calcula as ocorrências
+                        response = cliente.post("/series", json={
+                            "nome": nome, "inicio": data_hora, "frequencia": frequencia,
+                            "intervalo": int(intervalo), "contagem": int(ocorrencias),
+                        })
+                    else:
+                        response = cliente.post("/eventos/", json={"nome": nome, "data_hora": data_hora})
                     if response.status_code == 201:
+                        limpar_dados()
                         st.success(f"✅ Evento '{nome}' criado com sucesso!")
                         st.rerun()
                     else:
@@ -47,51 +230,104 @@ with tab1:
 with tab2:
     st.header("Listagem de Eventos")
     
+    col_filtro1, col_filtro2, col_filtro3 = st.columns([2, 1, 1])
+    with col_filtro1:
+        filtro = st.radio("Filtrar por:", list(PERIODOS_LISTAGEM), horizontal=True)
+    with col_filtro2:
+        por_pagina = st.selectbox("Eventos por página", [25, 50, 100, 200], index=1)
+    with col_filtro3:
+        modo = st.radio("Exibição:", ["Cartões", "Tabela"], horizontal=True)
+    
+    agora = agora_local()
+    periodo = PERIODOS_LISTAGEM[filtro]
+    
+    # Pilha com o cursor de cada página visitada (o da primeira página é None),
+    # para voltar sem refazer a paginação desde o início. Recomeça ao mudar os filtros.
+    consulta = (periodo, por_pagina)
+    if st.session_state.get("listagem_consulta") != consulta:
+        st.session_state.listagem_consulta = consulta
+        st.session_state.listagem_cursores = [None]
+    cursores = st.session_state.listagem_cursores
+    
     try:
-        response = requests.get(f"{API_URL}/eventos/", timeout=5)
+        # Só a página exibida é buscada e desenhada, qualquer que seja o total de eventos
+        eventos, proximo_cursor = buscar_pagina(por_pagina, cursores[-1], periodo)
+        total = buscar_total(periodo)
         
-        if response.status_code == 200:
-            eventos = response.json()
+        if not eventos and len(cursores) == 1:
+            st.info("📭 Nenhum evento encontrado." if periodo else "📭 Nenhum evento cadastrado.")
+        else:
+            col_nav1, col_nav2, col_nav3 = st.columns([1, 2, 1])
+            with col_nav1:
+                if st.button("◀ Anterior", disabled=len(cursores) == 1, use_container_width=True):
+                    cursores.pop()
+                    st.rerun()
+            with col_nav2:
+                total_paginas = max(1, -(-total // por_pagina))
+                st.markdown(
+                    f"<div style='text-align: center'>Página {len(cursores)} de {total_paginas} · "
+                    f"<b>{total} evento(s)</b></div>",
+                    unsafe_allow_html=True,
+                )
+            with col_nav3:
+                if st.button("Próxima ▶", disabled=proximo_cursor is None, use_container_width=True):
+                    cursores.append(proximo_cursor)
+                    st.rerun()
+            
+            if modo == "Tabela":
+                # Uma única tabela em vez de um expander com botões por evento
+                linhas = [
+                    {
+                        "ID": evento["id"],
+                        "Série": evento.get("serie_id"),
+                        "Nome": evento["nome"],
+                        "Data/Hora": evento["data_hora"].strftime("%d/%m/%Y %H:%M"),
+                        "Status": "⏰ PASSADO" if evento["data_hora"] < agora else "🔮 FUTURO",
+                    }
+                    for evento in eventos
+                ]
+                selecao = st.dataframe(
+                    linhas,
+                    hide_index=True,
+                    use_container_width=True,
+                    on_select="rerun",
+                    selection_mode="single-row",
+                    key=f"tabela_eventos_{len(cursores)}",
+                )
+                linhas_selecionadas = selecao.selection.rows
+                if linhas_selecionadas:
+                    evento = eventos[linhas_selecionadas[0]]
+                    serie_id = evento.get("serie_id")
+                    identificacao = f"série {serie_id}" if serie_id else f"ID {evento['id']}"
+                    st.write(f"**Selecionado:** {evento['nome']} ({identificacao})")
+                    col_btn1, col_btn2 = st.columns(2)
+                    with col_btn1:
+                        # Ocorrências de uma série não são editáveis individualmente
+                        if st.button("✏️ Editar", key="edit_selecionado", disabled=bool(serie_id),
+                                     use_container_width=True):
+                            iniciar_edicao(evento)
+                    with col_btn2:
+                        rotulo = "🗑️ Deletar série" if serie_id else "🗑️ Deletar"
+                        if st.button(rotulo, key="delete_selecionado", use_container_width=True):
+                            deletar_evento(evento)
+                else:
+                    st.caption("Selecione uma linha para editar ou deletar o evento.")
             
-            if not eventos:
-                st.info("📭 Nenhum evento cadastrado.")
             else:
-                eventos_ordenados = sorted(eventos, key=lambda e: e["data_hora"])
-                
-                col_filtro1, col_filtro2 = st.columns(2)
-                with col_filtro1:
-                    filtro = st.radio("Filtrar por:", ["Todos", "Esta Semana", "Este Mês"], horizontal=True)
-                
-                agora = datetime.now()
-                eventos_filtrados = eventos_ordenados
-                
-                if filtro == "Esta Semana":
-                    inicio_semana = agora.date() - timedelta(days=agora.weekday())
-                    fim_semana = inicio_semana + timedelta(days=6)
-                    eventos_filtrados = [
-                        e for e in eventos_ordenados
-                        if inicio_semana <= datetime.fromisoformat(e["data_hora"]).date() <= fim_semana
-                    ]
-                
-                elif filtro == "Este Mês":
-                    eventos_filtrados = [
-                        e for e in eventos_ordenados
-                        if datetime.fromisoformat(e["data_hora"]).month == agora.month
-                        and datetime.fromisoformat(e["data_hora"]).year == agora.year
-                    ]
-                
-                st.write(f"**{len(eventos_filtrados)} evento(s)**")
-                
-                for evento in eventos_filtrados:
-                    data_obj = datetime.fromisoformat(evento["data_hora"])
+                for evento in eventos:
+                    data_obj = evento["data_hora"]
                     data_fmt = data_obj.strftime("%d/%m/%Y %H:%M")
                     status = "⏰ PASSADO" if data_obj < agora else "🔮 FUTURO"
+                    serie_id = evento.get("serie_id")
+                    icone = "🔁" if serie_id else "📌"
+                    # Ocorrências não têm id próprio: a chave dos botões usa a série e a data
+                    chave = f"s{serie_id}_{data_obj.isoformat()}" if serie_id else evento["id"]
                     
-                    with st.expander(f"📌 {evento['nome']} - {data_fmt} {status}"):
+                    with st.expander(f"{icone} {evento['nome']} - {data_fmt} {status}"):
                         col1, col2, col3 = st.columns(3)
                         
                         with col1:
-                            st.write(f"**ID:** {evento['id']}")
+                            st.write(f"**Série:** {serie_id}" if serie_id else f"**ID:** {evento['id']}")
                         with col2:
                             st.write(f"**Nome:** {evento['nome']}")
                         with col3:
@@ -99,25 +335,14 @@ with tab2:
                         
                         col_btn1, col_btn2 = st.columns(2)
                         with col_btn1:
-                            if st.button(f"✏️ Editar", key=f"edit_{evento['id']}", use_container_width=True):
-                                st.session_state.edit_id = evento['id']
-                                st.session_state.edit_nome = evento['nome']
-                                st.session_state.edit_data = data_obj.date()
-                                st.session_state.edit_hora = data_obj.time()
-                                st.rerun()
+                            if st.button(f"✏️ Editar", key=f"edit_{chave}", disabled=bool(serie_id),
+                                         use_container_width=True):
+                                iniciar_edicao(evento)
                         
                         with col_btn2:
-                            if st.button(f"🗑️ Deletar", key=f"delete_{evento['id']}", use_container_width=True):
-                                try:
-                                    del_response = requests.delete(f"{API_URL}/eventos/{evento['id']}", timeout=5)
-                                    if del_response.status_code == 204:
-                                        st.success(f"✅ Evento deletado!")
-                                        st.rerun()
-                                    else:
-                                        detalhe = del_response.text if del_response.text else del_response.status_code
-                                        st.error(f"❌ Erro ao deletar evento: {detalhe}")
-                                except Exception as e:
-                                    st.error(f"❌ Erro de conexão: {e}")
+                            rotulo = "🗑️ Deletar série" if serie_id else "🗑️ Deletar"
+                            if st.button(rotulo, key=f"delete_{chave}", use_container_width=True):
+                                deletar_evento(evento)
     
     except Exception as e:
         st.error(f"❌ Não foi possível conectar à API: {e}")
@@ -137,12 +362,12 @@ if "edit_id" in st.session_state:
             if st.form_submit_button("💾 Atualizar", type="primary", use_container_width=True):
                 data_hora_edit = datetime.combine(data_edit, hora_edit).isoformat()
                 try:
-                    put_response = requests.put(
-                        f"{API_URL}/eventos/{st.session_state.edit_id}",
+                    put_response = cliente.put(
+                        f"/eventos/{st.session_state.edit_id}",
                         json={"nome": nome_edit, "data_hora": data_hora_edit},
-                        timeout=5
                     )
                     if put_response.status_code == 200:
+                        limpar_dados()
                         st.success(f"✅ Evento atualizado!")
                         del st.session_state.edit_id
                         st.rerun()
@@ -163,61 +388,52 @@ with tab3:
     
     col1, col2 = st.columns(2)
     with col1:
-        ano = st.number_input("Ano", min_value=2020, max_value=2050, value=datetime.now().year)
+        ano = st.number_input("Ano", min_value=2020, max_value=2050, value=agora_local().year)
     with col2:
         mes = st.selectbox(
             "Mês",
             range(1, 13),
             format_func=lambda x: ["", "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
                                    "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"][x],
-            index=datetime.now().month - 1
+            index=agora_local().month - 1
         )
     
     try:
-        response = requests.get(f"{API_URL}/eventos/", timeout=5)
-        if response.status_code == 200:
-            eventos = response.json()
-            
-            # Filtra eventos do mês
-            eventos_mes = {}
-            for evento in eventos:
-                data_obj = datetime.fromisoformat(evento["data_hora"])
-                if data_obj.year == ano and data_obj.month == mes:
-                    dia = data_obj.day
-                    if dia not in eventos_mes:
-                        eventos_mes[dia] = []
-                    eventos_mes[dia].append(evento)
-            
-            # Exibe calendário
-            nomes_meses = ["", "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-                          "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"]
-            
-            st.markdown(f"## {nomes_meses[mes]} de {ano}")
-            
-            cal = calendar.monthcalendar(ano, mes)
-            dias_semana = ["Seg", "Ter", "Qua", "Qui", "Sex", "Sab", "Dom"]
-            
+        # A API agrupa os eventos do mês por dia (total + primeiros eventos de cada dia)
+        eventos_mes = buscar_calendario_mes(ano, mes)
+        
+        # Exibe calendário
+        nomes_meses = ["", "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+                      "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"]
+        
+        st.markdown(f"## {nomes_meses[mes]} de {ano}")
+        
+        cal = calendar.monthcalendar(ano, mes)
+        dias_semana = ["Seg", "Ter", "Qua", "Qui", "Sex", "Sab", "Dom"]
+        
+        cols = st.columns(7)
+        for i, dia_nome in enumerate(dias_semana):
+            with cols[i]:
+                st.markdown(f"**{dia_nome}**")
+        
+        for semana in cal:
             cols = st.columns(7)
-            for i, dia_nome in enumerate(dias_semana):
+            for i, dia in enumerate(semana):
                 with cols[i]:
-                    st.markdown(f"**{dia_nome}**")
-            
-            for semana in cal:
-                cols = st.columns(7)
-                for i, dia in enumerate(semana):
-                    with cols[i]:
-                        if dia == 0:
-                            st.markdown("")
-                        else:
-                            st.markdown(f"### {dia}")
-                            if dia in eventos_mes:
-                                for evento in eventos_mes[dia]:
-                                    data_obj = datetime.fromisoformat(evento["data_hora"])
-                                    hora = data_obj.strftime("%H:%M")
-                                    st.markdown(f"📌 **{evento['nome']}**")
-                                    st.markdown(f"*{hora}*")
+                    if dia == 0:
+                        st.markdown("")
+                    else:
+                        st.markdown(f"### {dia}")
+                        if dia in eventos_mes:
+                            for evento in eventos_mes[dia]["eventos"]:
+                                icone = "🔁" if evento.get("serie_id") else "📌"
+                                st.markdown(f"{icone} **{evento['nome']}**")
+                                st.markdown(f"*{evento['hora']}*")
+                            restantes = eventos_mes[dia]["total"] - len(eventos_mes[dia]["eventos"])
+                            if restantes > 0:
+                                st.caption(f"+ {restantes} evento(s)")
     
-    except requests.exceptions.ConnectionError:
+    except requests.exceptions.RequestException:
         st.error("❌ Não foi possível conectar à API.")
 
 # TAB 4: Importar eventos.json
@@ -225,93 +441,143 @@ with tab4:
     st.header("📥 Importar Eventos do JSON")
     st.markdown("Utilize a caixa de diálogo abaixo para escolher um arquivo JSON.")
     
-    uploaded_file = st.file_uploader("Escolha um arquivo JSON", type=["json"])
+    uploaded_file = st.file_uploader("Escolha um arquivo JSON ou NDJSON", type=["json", "ndjson", "jsonl"])
     
     if uploaded_file is not None:
-        # Carrega dados do arquivo JSON
+        # Lê o arquivo de forma incremental, item a item
         try:
-            # st.file_uploader retorna um BytesIO, json.load pode ler diretamente
-            dados_json = json.load(uploaded_file)
+            # Para a prévia, basta ler os primeiros eventos do arquivo
+            previa = list(islice(itens_arquivo(uploaded_file), TAMANHO_PREVIA_IMPORTACAO))
+            uploaded_file.seek(0)
             
             st.subheader("📋 Eventos a Importar")
             
-            if not dados_json:
+            if not previa:
                 st.warning("📭 O arquivo JSON está vazio.")
             else:
-                st.write(f"**Total de eventos encontrados:** {len(dados_json)}")
+                st.write(f"**Tamanho do arquivo:** {uploaded_file.size / 1024:.1f} KB")
+                
+                # Campos do arquivo com o nome e a data (arquivos antigos usam "titulo")
+                campos = sorted({campo for item in previa if isinstance(item, dict) for campo in item})
+                col_campo1, col_campo2 = st.columns(2)
+                with col_campo1:
+                    padrao_nome = "nome" if "nome" in campos or "titulo" not in campos else "titulo"
+                    campo_nome = st.selectbox("Campo com o nome", campos or ["nome"],
+                                              index=campos.index(padrao_nome) if padrao_nome in campos else 0)
+                with col_campo2:
+                    campo_data = st.selectbox("Campo com a data/hora", campos or ["data_hora"],
+                                              index=campos.index("data_hora") if "data_hora" in campos else 0)
+                mapeamento = {
+                    origem: destino
+                    for origem, destino in ((campo_nome, "nome"), (campo_data, "data_hora"))
+                    if origem != destino
+                }
                 
                 # Exibe preview dos eventos
-                with st.expander("👁️ Visualizar eventos"):
-                    for idx, evento in enumerate(dados_json, 1):
+                with st.expander(f"👁️ Visualizar os primeiros {len(previa)} eventos"):
+                    for idx, evento in enumerate(previa, 1):
                         try:
                             # Tenta converter data_hora se estiver em formato string
-                            if isinstance(evento.get('data_hora'), str):
-                                data_obj = datetime.fromisoformat(evento['data_hora'])
+                            if isinstance(evento.get(campo_data), str):
+                                data_obj = datetime.fromisoformat(evento[campo_data])
                                 data_fmt = data_obj.strftime("%d/%m/%Y %H:%M")
                             else:
-                                data_fmt = str(evento.get('data_hora', 'Data inválida'))
+                                data_fmt = str(evento.get(campo_data, 'Data inválida'))
                             
-                            st.markdown(f"**{idx}. {evento.get('nome', 'Evento sem nome')}**")
+                            st.markdown(f"**{idx}. {evento.get(campo_nome, 'Evento sem nome')}**")
                             st.markdown(f"   📅 {data_fmt}")
                         except Exception as e:
-                            st.warning(f"**{idx}. {evento.get('nome', 'Evento sem nome')}** - ⚠️ Erro ao processar data")
+                            st.warning(f"**{idx}. Item inválido** - ⚠️ Erro ao processar evento")
+                
+                # A API ignora eventos já cadastrados (mesmo nome e data/hora): importar
+                # o mesmo arquivo de novo não duplica nada. A simulação não grava.
+                col_acao1, col_acao2 = st.columns(2)
+                with col_acao1:
+                    simular = st.button("🔍 Simular Importação", use_container_width=True)
+                with col_acao2:
+                    importar = st.button("✅ Importar Eventos para o Banco de Dados", type="primary", use_container_width=True)
                 
-                # Botão para importar
-                if st.button("✅ Importar Eventos para o Banco de Dados", type="primary", use_container_width=True):
-                    importados = 0
+                if simular or importar:
+                    contagem = {"novos": 0, "existentes": 0, "duplicados": 0}
+                    leitura = {"lidos": 0}
+                    inicios = {}  # id do lote -> posição do primeiro item no arquivo
+                    diferencas = []
                     erros = []
+                    progresso = st.progress(0.0, text="Simulando importação..." if simular else "Importando eventos...")
                     
-                    for evento in dados_json:
-                        try:
-                            nome = evento.get('nome', '')
-                            data_hora_str = evento.get('data_hora', '')
-                            
-                            if not nome or not data_hora_str:
-                                erros.append(f"Evento sem nome ou data: {evento}")
-                                continue
-                            
-                            # Converte string de data para ISO format se necessário
-                            try:
-                                data_obj = datetime.fromisoformat(data_hora_str)
-                                data_hora_iso = data_obj.isoformat()
-                            except (ValueError, TypeError):
-                                erros.append(f"Data inválida para '{nome}': {data_hora_str}")
-                                continue
-                            
-                            # Envia para API
-                            try:
-                                response = requests.post(
-                                    f"{API_URL}/eventos/",
-                                    json={"nome": nome, "data_hora": data_hora_iso},
-                                    timeout=5
-                                )
-
-                                if response.status_code == 201:
-                                    importados += 1
-                                else:
-                                    detalhes_resp = response.text if response.text else response.status_code
-                                    erros.append(f"Erro ao importar '{nome}': {detalhes_resp}")
-                            except Exception as e:
-                                erros.append(f"Erro ao enviar '{nome}': {e}")
+                    def lotes_arquivo():
+                        """Lê o arquivo um lote por vez (só os lotes em envio ficam na memória)."""
+                        for lote in em_lotes(itens_arquivo(uploaded_file), TAMANHO_LOTE_IMPORTACAO):
+                            inicios[id(lote)] = leitura["lidos"]
+                            leitura["lidos"] += len(lote)
+                            yield {"eventos": lote, "mapeamento": mapeamento, "simular": simular}
+                    
+                    # Envia alguns lotes ao mesmo tempo (uma transação por requisição)
+                    envios = cliente.enviar_em_paralelo(
+                        "POST", "/eventos/importar", lotes_arquivo(), max_paralelo=LOTES_PARALELOS_IMPORTACAO, timeout=60
+                    )
+                    for corpo, response, erro_conexao in envios:
+                        lote = corpo["eventos"]
+                        inicio = inicios.pop(id(lote))
+                        if erro_conexao is not None:
+                            erros.append(f"Erro ao enviar lote de {len(lote)} evento(s): {erro_conexao}")
+                        elif response.status_code == 200:
+                            resultado = response.json()
+                            for chave in contagem:
+                                contagem[chave] += resultado[chave]
+                            for item in resultado["diferencas"]:
+                                if item["situacao"] != "novo" or simular:
+                                    diferencas.append({**item, "indice": inicio + item["indice"] + 1})
+                            for erro_item in resultado["erros"]:
+                                linha = inicio + erro_item["indice"] + 1
+                                erros.append(f"Item {linha}: {erro_item['erro']}")
+                        else:
+                            detalhes_resp = response.text if response.text else response.status_code
+                            erros.append(f"Erro ao importar lote de {len(lote)} evento(s): {detalhes_resp}")
                         
-                        except Exception as e:
-                            erros.append(f"Erro processando evento: {str(e)}")
+                        fracao = uploaded_file.tell() / uploaded_file.size if uploaded_file.size else 1.0
+                        progresso.progress(min(fracao, 1.0), text=f"{leitura['lidos']} evento(s) lidos, {contagem['novos']} novo(s)")
+                    
+                    if importar and contagem["novos"] > 0:
+                        limpar_dados()
                     
                     # Exibe resultado da importação
                     st.markdown("---")
-                    st.subheader("📊 Resultado da Importação")
+                    st.subheader("📊 Resultado da Simulação" if simular else "📊 Resultado da Importação")
                     
-                    col_result1, col_result2, col_result3 = st.columns(3)
+                    col_result1, col_result2, col_result3, col_result4 = st.columns(4)
                     
                     with col_result1:
-                        st.metric("✅ Importados", importados)
+                        st.metric("🆕 A importar" if simular else "✅ Importados", contagem["novos"])
                     with col_result2:
-                        st.metric("⚠️ Erros", len(erros))
+                        st.metric("♻️ Já existentes", contagem["existentes"] + contagem["duplicados"])
                     with col_result3:
-                        st.metric("📋 Total", len(dados_json))
+                        st.metric("⚠️ Erros", len(erros))
+                    with col_result4:
+                        st.metric("📋 Total", leitura["lidos"])
                     
-                    if importados > 0:
-                        st.success(f"✅ {importados} evento(s) importado(s) com sucesso!")
+                    if importar and contagem["novos"] > 0:
+                        st.success(f"✅ {contagem['novos']} evento(s) importado(s) com sucesso!")
+                    elif importar and not erros:
+                        st.info("ℹ️ Nenhum evento novo: todos já estavam cadastrados.")
+                    
+                    if diferencas:
+                        # A API devolve as primeiras diferenças de cada lote
+                        with st.expander(f"🔍 Ver diferenças ({len(diferencas)} primeiras)"):
+                            situacoes = {"novo": "🆕 novo", "existente": "♻️ já existe", "duplicado": "🔁 repetido no arquivo"}
+                            st.dataframe(
+                                [
+                                    {
+                                        "Item": item["indice"],
+                                        "Nome": item["nome"],
+                                        "Data/Hora": datetime.fromisoformat(item["data_hora"]).strftime("%d/%m/%Y %H:%M"),
+                                        "Situação": situacoes[item["situacao"]],
+                                    }
+                                    for item in diferencas
+                                ],
+                                hide_index=True,
+                                use_container_width=True,
+                            )
                     
                     if erros:
                         with st.expander("🔍 Ver erros"):
@@ -324,5 +590,50 @@ with tab4:
             st.error(f"❌ Erro ao ler arquivo: {str(e)}")
 
 
+# TAB 5: Buscar
+with tab5:
+    st.header("🔎 Buscar Eventos")
+    
+    termos = st.text_input(
+        "Buscar pelo nome",
+        placeholder="Ex: reuniao equipe (acentos são ignorados; palavras incompletas também valem)",
+    ).strip()
+    
+    if termos:
+        try:
+            resultados = buscar_por_nome(termos)
+            if not resultados:
+                st.info(f"📭 Nenhum evento encontrado para '{termos}'.")
+            else:
+                st.write(f"**{len(resultados)} resultado(s)**, do mais relevante ao menos relevante")
+                agora = agora_local()
+                selecao = st.dataframe(
+                    [
+                        {
+                            "ID": evento["id"],
+                            "Nome": evento["nome"],
+                            "Data/Hora": evento["data_hora"].strftime("%d/%m/%Y %H:%M"),
+                            "Status": "⏰ PASSADO" if evento["data_hora"] < agora else "🔮 FUTURO",
+                        }
+                        for evento in resultados
+                    ],
+                    hide_index=True,
+                    use_container_width=True,
+                    on_select="rerun",
+                    selection_mode="single-row",
+                    key="tabela_busca",
+                )
+                if selecao.selection.rows:
+                    evento = resultados[selecao.selection.rows[0]]
+                    col_btn1, col_btn2 = st.columns(2)
+                    with col_btn1:
+                        if st.button("✏️ Editar", key="edit_busca", use_container_width=True):
+                            iniciar_edicao(evento)
+                    with col_btn2:
+                        if st.button("🗑️ Deletar", key="delete_busca", use_container_width=True):
+                            deletar_evento(evento)
+        except requests.exceptions.RequestException as e:
+            st.error(f"❌ Não foi possível conectar à API: {e}")
+
 st.markdown("---")
 st.markdown("<div style='text-align: center'><small>🚀 Gerenciador de Eventos | Full-Stack com SQLAlchemy + FastAPI + Streamlit</small></div>", unsafe_allow_html=True)
\ No newline at end of file
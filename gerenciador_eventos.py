@@ -4,7 +4,7 @@ Gerenciador de Eventos e Agendamento Simples
 
 Um programa educacional para demonstrar conceitos fundamentais de Python:
 - Funções e estruturas de controle
-- Manipulação de estruturas de dados (listas de dicionários)
+- Manipulação de estruturas de dados (listas de dicionários e colunas com array)
 - Persistência de dados (JSON)
 - Manipulação de datas e horas
 - Interação com o sistema de arquivos
@@ -15,14 +15,203 @@ Módulos utilizados:
 - time: Para inclusão de pausas programáticas (feedback visual)
 - calendar: Para exibição de calendários mensais
 - json: Para serialização (salvar) e desserialização (carregar) de dados
+  (snapshot em JSON e diário de alterações em NDJSON, uma linha por evento)
+- array e bisect: Para guardar os eventos em colunas compactas e ordenadas
+- importacao: Para ler o arquivo de eventos de forma incremental
+- argparse e sys: Para o modo de linha de comando (sem menu e sem pausas)
+- urllib: Para enviar os eventos à API do backend (comando sync) e baixar
+  só o que mudou nela desde a última vez (comando pull)
+- recorrencia: Para calcular as ocorrências das séries baixadas pelo pull
+
+Uso sem argumentos abre o menu interativo. Com um comando, roda sem
+interação, próprio para scripts e cron:
+    python gerenciador_eventos.py add "Reunião" 2025-11-20T14:00
+    python gerenciador_eventos.py list --since 2025-11-01 --until 2025-12-01
+    python gerenciador_eventos.py import eventos_grandes.ndjson
+    python gerenciador_eventos.py export --formato ndjson > eventos.ndjson
+    python gerenciador_eventos.py sync --api http://127.0.0.1:8000
+    python gerenciador_eventos.py pull --api http://127.0.0.1:8000
 """
 
 import os
+import sys
 import json
-from datetime import datetime
+import secrets
+import argparse
+import urllib.error
+import urllib.parse
+import urllib.request
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from types import SimpleNamespace
 import time
 import calendar
 
+import recorrencia
+from importacao import e_cabecalho_snapshot, em_lotes, iterar_eventos, normalizar_evento
+
+# Quantidade de eventos no diário que dispara a compactação no snapshot
+LIMITE_COMPACTACAO = 500
+
+# Endereço padrão da API e tamanho dos lotes enviados pelo comando sync
+API_URL = "http://127.0.0.1:8000"
+TAMANHO_LOTE_SYNC = 1000
+
+# Referência para converter datas em segundos inteiros (epoch) e de volta
+EPOCH = datetime(1970, 1, 1)
+
+
+def para_segundos(data_hora):
+    """Converte um datetime (sem fuso, no horário local) em segundos desde 1970."""
+    if data_hora.tzinfo is not None:
+        # Datas com fuso são convertidas para o horário local da máquina
+        data_hora = data_hora.astimezone().replace(tzinfo=None)
+    return calendar.timegm(data_hora.timetuple())
+
+
+def de_segundos(segundos):
+    """Inverso de para_segundos()."""
+    return EPOCH + timedelta(seconds=segundos)
+
+
+class RegistroEvento:
+    """
+    Um evento lido do armazém.
+    __slots__ evita o dicionário de atributos de cada objeto (menos memória).
+    """
+
+    __slots__ = ("nome", "data_hora")
+
+    def __init__(self, nome, data_hora):
+        self.nome = nome
+        self.data_hora = data_hora
+
+    def para_dicionario(self):
+        return {"nome": self.nome, "data_hora": self.data_hora.isoformat()}
+
+
+class ArmazemEventos:
+    """
+    Guarda os eventos em colunas, sempre em ordem cronológica:
+    - _instantes: array('q') com a data/hora de cada evento em segundos (8 bytes
+      por evento, em vez de uma string ISO e um datetime)
+    - _nomes: lista com o nome de cada evento, na mesma posição
+
+    Como a coluna de instantes está ordenada, a busca binária (bisect) encontra
+    o começo e o fim de qualquer período em O(log n), sem percorrer a lista e
+    sem converter strings em datetime a cada exibição.
+    """
+
+    def __init__(self):
+        self._instantes = array("q")
+        self._nomes = []
+
+    @classmethod
+    def de_dicionarios(cls, eventos):
+        """
+        Monta o armazém a partir dos dicionários lidos do arquivo.
+        Aceita a chave "nome" ou "titulo" (arquivos antigos) e ignora itens inválidos.
+        """
+        linhas = []
+        for evento in eventos:
+            if not isinstance(evento, dict):
+                continue
+            nome = evento.get("nome") or evento.get("titulo")
+            try:
+                data_hora = datetime.fromisoformat(evento["data_hora"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if nome:
+                linhas.append((para_segundos(data_hora), nome))
+
+        # Ordena uma única vez na carga; as inserções seguintes mantêm a ordem
+        linhas.sort(key=lambda linha: linha[0])
+        armazem = cls()
+        armazem._instantes = array("q", (instante for instante, _ in linhas))
+        armazem._nomes = [nome for _, nome in linhas]
+        return armazem
+
+    def __len__(self):
+        return len(self._instantes)
+
+    def adicionar(self, nome, data_hora):
+        """Insere o evento na posição certa (depois dos eventos de mesmo horário)."""
+        instante = para_segundos(data_hora)
+        posicao = bisect_right(self._instantes, instante)
+        self._instantes.insert(posicao, instante)
+        self._nomes.insert(posicao, nome)
+
+    def adicionar_varios(self, novos):
+        """
+        Insere vários eventos (pares nome, data_hora) de uma vez. Inserir um a
+        um com bisect move as colunas a cada evento; aqui elas são remontadas
+        uma única vez (o sort do Python aproveita as partes já ordenadas).
+        """
+        linhas = list(zip(self._instantes, self._nomes))
+        linhas.extend((para_segundos(data_hora), nome) for nome, data_hora in novos)
+        linhas.sort(key=lambda linha: linha[0])
+        self._instantes = array("q", (instante for instante, _ in linhas))
+        self._nomes = [nome for _, nome in linhas]
+
+    def contem(self, nome, data_hora):
+        """Verifica se há um evento com este nome e data/hora (busca binária pelo horário)."""
+        instante = para_segundos(data_hora)
+        inicio = bisect_left(self._instantes, instante)
+        fim = bisect_right(self._instantes, instante, inicio)
+        return nome in self._nomes[inicio:fim]
+
+    def aplicar(self, removidos, novos):
+        """
+        Remove uma ocorrência de cada evento de `removidos` e insere os de
+        `novos` (pares nome, data_hora), remontando as colunas uma única vez.
+        """
+        remover = {}
+        for nome, data_hora in removidos:
+            chave = (para_segundos(data_hora), nome)
+            remover[chave] = remover.get(chave, 0) + 1
+        linhas = []
+        for linha in zip(self._instantes, self._nomes):
+            if remover.get(linha):
+                remover[linha] -= 1
+                continue
+            linhas.append(linha)
+        linhas.extend((para_segundos(data_hora), nome) for nome, data_hora in novos)
+        linhas.sort(key=lambda linha: linha[0])
+        self._instantes = array("q", (instante for instante, _ in linhas))
+        self._nomes = [nome for _, nome in linhas]
+
+    def _posicao(self, data_hora):
+        """Índice do primeiro evento em data_hora ou depois (None = fim da lista)."""
+        if data_hora is None:
+            return len(self._instantes)
+        return bisect_left(self._instantes, para_segundos(data_hora))
+
+    def _registros(self, inicio, fim):
+        for posicao in range(inicio, fim):
+            yield RegistroEvento(self._nomes[posicao], de_segundos(self._instantes[posicao]))
+
+    def intervalo(self, inicio=None, fim=None):
+        """Eventos com inicio <= data_hora < fim, em ordem cronológica."""
+        primeiro = self._posicao(inicio) if inicio is not None else 0
+        return self._registros(primeiro, max(primeiro, self._posicao(fim)))
+
+    def dividir(self, agora):
+        """Retorna (passados, futuros) em relação a `agora`."""
+        return self.intervalo(fim=agora), self.intervalo(inicio=agora)
+
+    def do_mes(self, ano, mes):
+        inicio = datetime(ano, mes, 1)
+        fim = datetime(ano + 1, 1, 1) if mes == 12 else datetime(ano, mes + 1, 1)
+        return self.intervalo(inicio, fim)
+
+    def __iter__(self):
+        return self._registros(0, len(self._instantes))
+
+    def para_dicionarios(self):
+        """Lista de dicionários no formato do arquivo JSON."""
+        return [registro.para_dicionario() for registro in self]
+
 
 def configurar_ambiente():
     """
@@ -42,53 +231,169 @@ def configurar_ambiente():
 
 def carregar_eventos(caminho_arquivo):
     """
-    Carrega a lista de eventos armazenados em um arquivo JSON.
+    Itera sobre os eventos armazenados em um arquivo JSON, um por vez.
+    Nada é gerado se o arquivo não existir.
     """
     # Verifica se o arquivo existe usando os.path.exists()
-    if os.path.exists(caminho_arquivo):
-        try:
-            # Abre o arquivo em modo leitura ('r')
-            with open(caminho_arquivo, "r", encoding="utf-8") as arquivo:
-                # json.load() deserializa o conteúdo do arquivo para uma lista Python
-                eventos = json.load(arquivo)
-                return eventos
-        except (json.JSONDecodeError, IOError):
-            # Se houver erro na leitura ou no JSON, retorna lista vazia
-            print("⚠️  Erro ao carregar eventos. Iniciando com lista vazia.")
-            return []
-    else:
-        # Arquivo não existe, retorna lista vazia
-        return []
-
-
-def salvar_eventos(eventos, caminho_arquivo):
+    if not os.path.exists(caminho_arquivo):
+        return
+    try:
+        # Abre o arquivo em modo leitura ('r')
+        with open(caminho_arquivo, "r", encoding="utf-8") as arquivo:
+            # iterar_eventos() lê o arquivo em blocos, um evento por vez, e
+            # quem consome monta o armazém sem uma lista com o arquivo inteiro
+            yield from iterar_eventos(arquivo)
+    except (json.JSONDecodeError, IOError):
+        # Se houver erro na leitura ou no JSON, fica com os eventos lidos até ali
+        print("⚠️  Erro ao carregar eventos. O restante do arquivo foi ignorado.", file=sys.stderr)
+
+
+def salvar_eventos(eventos, caminho_arquivo, geracao=None):
     """
-    Salva a lista de eventos em um arquivo JSON.
+    Salva os eventos (um ArmazemEventos) em um arquivo JSON (snapshot).
+    O arquivo é escrito em um temporário e trocado com os.replace(): se o
+    programa for interrompido no meio, o snapshot anterior continua inteiro.
+    Com `geracao`, o primeiro item do array é o cabeçalho {"geracao": ...}.
     Retorna:
-        None
+        True se salvou, False em caso de erro
     """
-    # Exibe mensagem de feedback
-    print("💾 Salvando dados...")
-    
-    # time.sleep(0.5): Pausa por 0,5 segundos para melhorar a experiência visual
-    # Útil para demonstrar operações assíncronas e dar feedback visual ao usuário
-    time.sleep(0.5)
-    
+    caminho_temporario = caminho_arquivo + ".tmp"
     try:
-        # Abre o arquivo em modo escrita ('w')
-        with open(caminho_arquivo, "w", encoding="utf-8") as arquivo:
+        # Abre o arquivo temporário em modo escrita ('w')
+        with open(caminho_temporario, "w", encoding="utf-8") as arquivo:
             # json.dump() serializa a lista Python para o formato JSON no arquivo
             # indent=2: Formata o JSON com indentação de 2 espaços (legibilidade)
-            json.dump(eventos, arquivo, indent=2, ensure_ascii=False)
-        
-        print("✅ Dados salvos com sucesso!\n")
+            itens = eventos.para_dicionarios()
+            if geracao is not None:
+                itens.insert(0, {"geracao": geracao})
+            json.dump(itens, arquivo, indent=2, ensure_ascii=False)
+            # Garante que os dados chegaram ao disco antes da troca
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        # os.replace() troca os arquivos de forma atômica
+        os.replace(caminho_temporario, caminho_arquivo)
+        return True
     except IOError as e:
-        print(f"❌ Erro ao salvar dados: {e}\n")
+        print(f"❌ Erro ao salvar dados: {e}\n", file=sys.stderr)
+        return False
 
 
-def adicionar_evento(eventos, caminho_arquivo):
+class DiarioEventos:
     """
-    Adiciona um novo evento à lista de eventos.
+    Persistência com diário (journal) somente de acréscimo:
+
+    - Cada evento novo vira uma linha no final de dados/eventos.jsonl, então
+      adicionar um evento escreve só essa linha (O(1)), em vez de regravar o
+      arquivo inteiro.
+    - De tempos em tempos (LIMITE_COMPACTACAO linhas) o diário é compactado:
+      todos os eventos são gravados no snapshot dados/eventos.json e o diário
+      recomeça vazio.
+    - Na carga, o snapshot é lido e o diário é reaplicado por cima dele.
+
+    Cada compactação sorteia uma geração, gravada no primeiro item do
+    snapshot e na primeira linha do diário novo. Se o programa parar entre a
+    troca do snapshot e a troca do diário, o snapshot novo já contém os
+    eventos do diário antigo; a geração diferente mostra isso e o diário
+    antigo é ignorado, sem duplicar (nem ressuscitar) eventos.
+    """
+
+    def __init__(self, caminho_arquivo):
+        self.caminho_snapshot = caminho_arquivo
+        self.caminho_diario = os.path.splitext(caminho_arquivo)[0] + ".jsonl"
+        self.entradas = 0
+        # Geração do snapshot lido (None se ele não tiver cabeçalho); vai no
+        # cabeçalho de um diário novo
+        self.geracao = None
+        # Eventos do snapshot lido (diários antigos guardavam essa contagem)
+        self.tamanho_snapshot = 0
+
+    def carregar(self):
+        """
+        Itera sobre os eventos do snapshot e depois sobre os do diário. O
+        diário (no máximo LIMITE_COMPACTACAO linhas) só é lido depois do
+        snapshot, quando já se sabe a geração dele.
+        """
+        self.geracao = None
+        self.tamanho_snapshot = 0
+        for posicao, evento in enumerate(carregar_eventos(self.caminho_snapshot)):
+            if posicao == 0 and e_cabecalho_snapshot(evento):
+                self.geracao = evento["geracao"]
+                continue
+            self.tamanho_snapshot += 1
+            yield evento
+        if not os.path.exists(self.caminho_diario):
+            return
+
+        with open(self.caminho_diario, "r+b") as arquivo:
+            linhas = arquivo.read().split(b"\n")
+            # Tudo depois da última quebra de linha é uma escrita interrompida
+            incompleta = linhas.pop()
+            validas = []
+            for linha in linhas:
+                try:
+                    validas.append(json.loads(linha))
+                except ValueError:
+                    print("⚠️  Linha inválida no diário de eventos ignorada.", file=sys.stderr)
+            if incompleta:
+                print("⚠️  Última linha do diário estava incompleta e foi descartada.", file=sys.stderr)
+                # Remove o trecho incompleto para os próximos acréscimos começarem numa linha nova
+                arquivo.truncate(arquivo.tell() - len(incompleta))
+
+        cabecalho = validas[0] if validas and ("geracao" in validas[0] or "snapshot" in validas[0]) else None
+        if cabecalho is not None:
+            validas = validas[1:]
+            if "geracao" in cabecalho:
+                atual = cabecalho["geracao"] == self.geracao
+            else:
+                # Diário gravado antes das gerações: só havia a contagem
+                atual = self.geracao is None and cabecalho["snapshot"] == self.tamanho_snapshot
+            if not atual:
+                # Diário já incorporado ao snapshot por uma compactação interrompida;
+                # apagado para os próximos registros abrirem um diário da geração atual
+                os.remove(self.caminho_diario)
+                validas = []
+        self.entradas = len(validas)
+        yield from validas
+
+    def registrar(self, evento):
+        """Acrescenta um evento (dicionário) ao final do diário."""
+        linha = json.dumps(evento, ensure_ascii=False) + "\n"
+        if not os.path.exists(self.caminho_diario) or os.path.getsize(self.caminho_diario) == 0:
+            # Diário novo: também precisa do cabeçalho, senão uma compactação
+            # interrompida reaplicaria as entradas sobre o snapshot novo
+            linha = json.dumps({"geracao": self.geracao}) + "\n" + linha
+        with open(self.caminho_diario, "a", encoding="utf-8") as arquivo:
+            arquivo.write(linha)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        self.entradas += 1
+
+    def precisa_compactar(self):
+        return self.entradas >= LIMITE_COMPACTACAO
+
+    def compactar(self, eventos):
+        """Grava todos os eventos (ArmazemEventos) no snapshot e recomeça o diário."""
+        # Mensagens de status vão para stderr: nos comandos (import, pull...)
+        # a saída padrão fica só com os dados
+        print("💾 Compactando dados...", file=sys.stderr)
+        geracao = secrets.token_hex(8)
+        if not salvar_eventos(eventos, self.caminho_snapshot, geracao):
+            return
+        caminho_temporario = self.caminho_diario + ".tmp"
+        with open(caminho_temporario, "w", encoding="utf-8") as arquivo:
+            arquivo.write(json.dumps({"geracao": geracao}) + "\n")
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(caminho_temporario, self.caminho_diario)
+        self.geracao = geracao
+        self.tamanho_snapshot = len(eventos)
+        self.entradas = 0
+        print("✅ Dados salvos com sucesso!\n", file=sys.stderr)
+
+
+def adicionar_evento(eventos, diario):
+    """
+    Adiciona um novo evento ao armazém de eventos e o registra no diário.
     Retorna:
         None
     """
@@ -105,7 +410,7 @@ def adicionar_evento(eventos, caminho_arquivo):
     
     # Variável para controlar a validação
     data_hora_valida = False
-    data_hora_str = None
+    datetime_obj = None
     
     # Loop while para garantir que o usuário insira dados válidos
     while not data_hora_valida:
@@ -127,25 +432,17 @@ def adicionar_evento(eventos, caminho_arquivo):
             # Se chegou aqui, o formato é válido
             data_hora_valida = True
             
-            # Converte o objeto datetime para string ISO (serializável em JSON)
-            # ISO format: AAAA-MM-DDTHH:MM:SS
-            data_hora_str = datetime_obj.isoformat()
-            
         except ValueError:
             # Captura erros de formato de data/hora
             print("❌ Formato inválido! Use DD-MM-AAAA para data e HH:MM para hora.\n")
     
-    # Cria um dicionário com os dados do evento
-    novo_evento = {
-        "nome": nome,
-        "data_hora": data_hora_str  # Armazenado como string ISO para ser JSON-serializável
-    }
-    
-    # Adiciona o novo evento à lista
-    eventos.append(novo_evento)
+    # Insere o evento já na posição certa da ordem cronológica
+    eventos.adicionar(nome, datetime_obj)
     
-    # Salva os eventos no arquivo
-    salvar_eventos(eventos, caminho_arquivo)
+    # Grava só o evento novo no final do diário
+    diario.registrar({"nome": nome, "data_hora": datetime_obj.isoformat()})
+    if diario.precisa_compactar():
+        diario.compactar(eventos)
     
     print(f"✅ Evento '{nome}' adicionado com sucesso!\n")
 
@@ -153,7 +450,7 @@ def adicionar_evento(eventos, caminho_arquivo):
 def listar_eventos(eventos):
     """
     Lista todos os eventos armazenados, indicando se são passados ou futuros.
-    Esta função ordena os eventos cronologicamente e exibe-os com formatação.
+    Os eventos já estão em ordem cronológica no armazém e são exibidos com formatação.
     Retorna:
         None
     """
@@ -171,46 +468,34 @@ def listar_eventos(eventos):
         print("📭 Nenhum evento cadastrado.\n")
         return
     
-    # Ordena os eventos pela data_hora
-    # Usa a função sorted() com uma função lambda para extrair a chave de ordenação
-    # lambda: função anônima que retorna o valor a ser usado na ordenação
-    eventos_ordenados = sorted(eventos, key=lambda e: e["data_hora"])
-    
     # Obtém a data/hora atual para comparação
     agora = datetime.now()
     
+    # DESAFIO 2: Comparação de datas para identificar eventos passados/futuros
+    # O armazém já está em ordem cronológica; a busca binária encontra onde
+    # terminam os eventos passados, sem comparar evento por evento
+    passados, futuros = eventos.dividir(agora)
+    
     print("\n📋 Eventos cadastrados:\n")
     
-    # Itera sobre os eventos ordenados
-    for i, evento in enumerate(eventos_ordenados, 1):
-        # Converte a string ISO de volta para um objeto datetime
-        # datetime.fromisoformat() é o inverso de isoformat()
-        data_hora_obj = datetime.fromisoformat(evento["data_hora"])
-        
-        # DESAFIO 2: Comparação de datas para identificar eventos passados/futuros
-        if data_hora_obj < agora:
-            # Evento já passou
-            status = "[PASSADO]"
-            emoji = "⏰"
-        else:
-            # Evento ainda não aconteceu
-            status = "[FUTURO]"
-            emoji = "🔮"
-        
-        # Formata a data/hora para exibição: DD/MM/AAAA às HH:MM
-        data_formatada = data_hora_obj.strftime("%d/%m/%Y às %H:%M")
-        
-        # Exibe o evento com formatação clara
-        print(f"{i}. {evento['nome']}")
-        print(f"   {emoji} {data_formatada} {status}")
-        print()
+    i = 0
+    for status, emoji, grupo in (("[PASSADO]", "⏰", passados), ("[FUTURO]", "🔮", futuros)):
+        for evento in grupo:
+            i += 1
+            # Formata a data/hora para exibição: DD/MM/AAAA às HH:MM
+            data_formatada = evento.data_hora.strftime("%d/%m/%Y às %H:%M")
+            
+            # Exibe o evento com formatação clara
+            print(f"{i}. {evento.nome}")
+            print(f"   {emoji} {data_formatada} {status}")
+            print()
 
 
-def visualizar_calendario():
+def visualizar_calendario(eventos):
     """
-    Exibe o calendário de um mês específico.
+    Exibe o calendário de um mês específico e os eventos desse mês.
     Args:
-        None    
+        eventos: ArmazemEventos com os eventos cadastrados
     Retorna:
         None
     """
@@ -243,6 +528,11 @@ def visualizar_calendario():
         calendario = calendar.month(ano, mes)
         print(calendario)
         
+        # Busca apenas os eventos do mês (consulta por intervalo no armazém)
+        for evento in eventos.do_mes(ano, mes):
+            print(f"   • {evento.data_hora.strftime('%d/%m às %H:%M')} - {evento.nome}")
+        print()
+        
     except ValueError:
         print("❌ Entrada inválida! Use números inteiros para ano e mês.\n")
 
@@ -258,8 +548,9 @@ def menu_principal():
     # Configura o ambiente (cria pastas e define caminhos)
     caminho_arquivo = configurar_ambiente()
     
-    # Carrega os eventos existentes
-    eventos = carregar_eventos(caminho_arquivo)
+    # Carrega o snapshot e reaplica o diário, montando o armazém em colunas
+    diario = DiarioEventos(caminho_arquivo)
+    eventos = ArmazemEventos.de_dicionarios(diario.carregar())
     
     # Loop principal do programa
     # Continua até que o usuário escolha sair (opção 5)
@@ -279,9 +570,7 @@ def menu_principal():
         # Estrutura if/elif/else para tratar cada opção
         if opcao == "1":
             # Opção 1: Adicionar evento
-            adicionar_evento(eventos, caminho_arquivo)
-            # Recarrega os eventos após adicionar
-            eventos = carregar_eventos(caminho_arquivo)
+            adicionar_evento(eventos, diario)
             
         elif opcao == "2":
             # Opção 2: Listar eventos
@@ -289,10 +578,13 @@ def menu_principal():
             
         elif opcao == "3":
             # Opção 3: Visualizar calendário
-            visualizar_calendario()
+            visualizar_calendario(eventos)
             
         elif opcao == "4":
             # Opção 4: Sair do programa
+            # Incorpora o diário ao snapshot para a próxima carga ser mais rápida
+            if diario.entradas:
+                diario.compactar(eventos)
             print("\n👋 Até logo! Programa encerrado.\n")
             break
             
@@ -301,10 +593,333 @@ def menu_principal():
             print("❌ Opção inválida! Por favor, escolha 1, 2, 3 ou 4.\n")
 
 
+
+# ============================================================
+# Modo de linha de comando (sem menu interativo e sem pausas)
+# ============================================================
+
+def ler_data(texto):
+    """Converte o argumento de data (ISO ou DD-MM-AAAA [HH:MM]) em datetime."""
+    for formato in ("%d-%m-%Y %H:%M", "%d-%m-%Y"):
+        try:
+            return datetime.strptime(texto, formato)
+        except ValueError:
+            pass
+    try:
+        return datetime.fromisoformat(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"data inválida: {texto!r} (use AAAA-MM-DD[THH:MM] ou DD-MM-AAAA [HH:MM])"
+        )
+
+
+def abrir_armazem(args):
+    diario = DiarioEventos(args.arquivo or configurar_ambiente())
+    return diario, ArmazemEventos.de_dicionarios(diario.carregar())
+
+
+def comando_add(args):
+    diario, eventos = abrir_armazem(args)
+    eventos.adicionar(args.nome, args.data_hora)
+    diario.registrar({"nome": args.nome, "data_hora": args.data_hora.isoformat()})
+    if diario.precisa_compactar():
+        diario.compactar(eventos)
+    print(f"✅ Evento '{args.nome}' adicionado.", file=sys.stderr)
+    return 0
+
+
+def comando_list(args):
+    _, eventos = abrir_armazem(args)
+    selecionados = eventos.intervalo(args.since, args.until)
+    if args.formato == "json":
+        json.dump([evento.para_dicionario() for evento in selecionados], sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return 0
+
+    agora = datetime.now()
+    for evento in selecionados:
+        if args.formato == "ndjson":
+            print(json.dumps(evento.para_dicionario(), ensure_ascii=False))
+        else:
+            status = "PASSADO" if evento.data_hora < agora else "FUTURO"
+            print(f"{evento.data_hora:%Y-%m-%d %H:%M}  [{status}]  {evento.nome}")
+    return 0
+
+
+def ler_itens(caminho):
+    """Itera sobre os eventos de um arquivo JSON/NDJSON ('-' lê da entrada padrão)."""
+    if caminho == "-":
+        yield from iterar_eventos(sys.stdin.buffer)
+        return
+    with open(caminho, "rb") as arquivo:
+        yield from iterar_eventos(arquivo)
+
+
+def comando_import(args):
+    diario, eventos = abrir_armazem(args)
+    novos = []
+    erros = 0
+    try:
+        for indice, item in enumerate(ler_itens(args.entrada)):
+            # Um snapshot deste programa começa com o cabeçalho da geração
+            if indice == 0 and e_cabecalho_snapshot(item):
+                continue
+            # Aceita arquivos antigos com "titulo" no lugar de "nome"
+            if isinstance(item, dict) and "nome" not in item and "titulo" in item:
+                item = {**item, "nome": item["titulo"]}
+            try:
+                evento = normalizar_evento(item)
+            except ValueError as e:
+                erros += 1
+                print(f"⚠️  Item {indice}: {e}", file=sys.stderr)
+                continue
+            novos.append((evento["nome"], datetime.fromisoformat(evento["data_hora"])))
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"❌ Erro ao ler {args.entrada}: {e}", file=sys.stderr)
+        return 1
+
+    if novos:
+        eventos.adicionar_varios(novos)
+        # Uma importação grande iria inteira para o diário; gravar o snapshot
+        # uma vez é mais barato do que reaplicar milhares de linhas depois
+        diario.compactar(eventos)
+    print(f"✅ {len(novos)} evento(s) importado(s), {erros} com erro.", file=sys.stderr)
+    return 1 if erros else 0
+
+
+def comando_export(args):
+    _, eventos = abrir_armazem(args)
+    saida = open(args.saida, "w", encoding="utf-8") if args.saida != "-" else sys.stdout
+    try:
+        selecionados = eventos.intervalo(args.since, args.until)
+        if args.formato == "ndjson":
+            for evento in selecionados:
+                saida.write(json.dumps(evento.para_dicionario(), ensure_ascii=False) + "\n")
+        else:
+            json.dump([evento.para_dicionario() for evento in selecionados], saida, ensure_ascii=False, indent=2)
+            saida.write("\n")
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+    return 0
+
+
+def enviar_lote(api, lote, timeout, simular=False):
+    """POST de um lote em /eventos/importar (idempotente); retorna o JSON da resposta."""
+    corpo = {"eventos": lote, "simular": simular}
+    requisicao = urllib.request.Request(
+        f"{api.rstrip('/')}/eventos/importar",
+        data=json.dumps(corpo, ensure_ascii=False).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(requisicao, timeout=timeout) as resposta:
+        return json.load(resposta)
+
+
+def comando_sync(args):
+    diario, eventos = abrir_armazem(args)
+    # Ocorrências de séries baixadas pelo pull já estão na API como série;
+    # enviá-las criaria eventos avulsos repetindo cada ocorrência
+    estado = carregar_estado_sync(caminho_estado_sync(diario.caminho_snapshot), args.api)
+    ocorrencias = {(nome, data_hora) for lista in estado["series"].values() for nome, data_hora in lista}
+    registros = (
+        registro for registro in (evento.para_dicionario() for evento in eventos.intervalo(args.since, args.until))
+        if (registro["nome"], registro["data_hora"]) not in ocorrencias
+    )
+    # A API ignora os eventos que já existem (mesmo nome e data/hora), então
+    # sincronizar de novo não duplica nada
+    novos = existentes = erros = 0
+    for numero, lote in enumerate(em_lotes(registros, args.lote), 1):
+        try:
+            resultado = enviar_lote(args.api, lote, args.timeout, args.simular)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            print(f"❌ Falha ao enviar o lote {numero}: {e}", file=sys.stderr)
+            return 1
+        novos += resultado["novos"]
+        existentes += resultado["existentes"] + resultado["duplicados"]
+        erros += len(resultado["erros"])
+        print(f"📤 Lote {numero}: {resultado['novos']}/{len(lote)} novo(s)", file=sys.stderr)
+    acao = "seriam enviados" if args.simular else "enviado(s)"
+    print(f"✅ {novos} evento(s) {acao} para {args.api}, {existentes} já existente(s), {erros} com erro.",
+          file=sys.stderr)
+    return 1 if erros else 0
+
+
+def caminho_estado_sync(caminho_arquivo):
+    return os.path.splitext(caminho_arquivo)[0] + ".sync.json"
+
+
+def carregar_estado_sync(caminho, api):
+    """
+    Estado do comando pull: a versão da API já baixada, o (nome, data_hora)
+    no arquivo local de cada id de evento da API e as ocorrências gravadas
+    de cada série. Outra API (ou nenhum estado salvo) recomeça do zero, com
+    uma sincronização completa.
+    """
+    try:
+        with open(caminho, "r", encoding="utf-8") as arquivo:
+            estado = json.load(arquivo)
+        if estado.get("api") == api:
+            estado.setdefault("series", {})
+            return estado
+    except (OSError, ValueError):
+        pass
+    return {"api": api, "versao": None, "ids": {}, "series": {}}
+
+
+def salvar_estado_sync(caminho, estado):
+    caminho_temporario = caminho + ".tmp"
+    with open(caminho_temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(estado, arquivo, ensure_ascii=False)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(caminho_temporario, caminho)
+
+
+def baixar_mudancas(api, desde, cursor, limite, timeout):
+    """GET de uma página de /eventos/mudancas; retorna o JSON da resposta."""
+    parametros = {"limite": limite, "desde": desde, "cursor": cursor}
+    consulta = urllib.parse.urlencode({chave: valor for chave, valor in parametros.items() if valor is not None})
+    with urllib.request.urlopen(f"{api.rstrip('/')}/eventos/mudancas?{consulta}", timeout=timeout) as resposta:
+        return json.load(resposta)
+
+
+def ocorrencias_serie(serie):
+    """Ocorrências (nome, data_hora) de uma série recebida de /eventos/mudancas."""
+    regra = SimpleNamespace(
+        inicio=datetime.fromisoformat(serie["inicio"]), frequencia=serie["frequencia"],
+        intervalo=serie["intervalo"], contagem=serie["contagem"],
+    )
+    return [(serie["nome"], data_hora) for data_hora in recorrencia.expandir(regra)]
+
+
+def comando_pull(args):
+    diario, eventos = abrir_armazem(args)
+    caminho_estado = caminho_estado_sync(diario.caminho_snapshot)
+    estado = carregar_estado_sync(caminho_estado, args.api)
+
+    # Baixa todas as páginas antes de alterar o arquivo: id -> [nome, data_hora]
+    # (eventos) ou a série recebida, e None para os removidos
+    alterados, series_alteradas = {}, {}
+    cursor = None
+    while True:
+        try:
+            resposta = baixar_mudancas(args.api, estado["versao"], cursor, args.lote, args.timeout)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            print(f"❌ Falha ao baixar as mudanças: {e}", file=sys.stderr)
+            return 1
+        for mudanca in resposta["mudancas"]:
+            # Em ordem de versão: a última mudança de cada id é a que vale
+            removido = mudanca.get("removido")
+            if "serie_id" in mudanca:
+                series_alteradas[str(mudanca["serie_id"])] = None if removido else mudanca
+            else:
+                alterados[str(mudanca["id"])] = None if removido else [mudanca["nome"], mudanca["data_hora"]]
+        cursor = resposta["proximo_cursor"]
+        if not cursor:
+            break
+
+    ids = estado["ids"]
+    removidos, novos = [], []
+    for evento_id, atual in alterados.items():
+        anterior = ids.pop(evento_id, None)
+        if anterior is not None:
+            removidos.append((anterior[0], datetime.fromisoformat(anterior[1])))
+        if atual is None:
+            continue
+        ids[evento_id] = atual
+        nome, data_hora = atual[0], datetime.fromisoformat(atual[1])
+        # Evento que já estava no arquivo (ex.: enviado antes pelo sync) não é duplicado
+        if anterior is None and eventos.contem(nome, data_hora):
+            continue
+        novos.append((nome, data_hora))
+
+    # O arquivo local não tem séries: cada uma vira as suas ocorrências
+    series = estado["series"]
+    for serie_id, serie in series_alteradas.items():
+        for nome, data_hora in series.pop(serie_id, ()):
+            removidos.append((nome, datetime.fromisoformat(data_hora)))
+        if serie is None:
+            continue
+        ocorrencias = ocorrencias_serie(serie)
+        series[serie_id] = [[nome, data_hora.isoformat()] for nome, data_hora in ocorrencias]
+        novos.extend(ocorrencias)
+
+    if removidos or novos:
+        eventos.aplicar(removidos, novos)
+        diario.compactar(eventos)
+    estado["versao"] = resposta["versao"]
+    salvar_estado_sync(caminho_estado, estado)
+    print(f"✅ {len(alterados) + len(series_alteradas)} mudança(s) baixada(s) de {args.api}: {len(novos)} evento(s) gravado(s), "
+          f"{len(removidos)} substituído(s) ou removido(s). Versão {estado['versao']}.", file=sys.stderr)
+    return 0
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        description="Gerenciador de eventos. Sem comando, abre o menu interativo."
+    )
+    parser.add_argument("--arquivo", help="Arquivo JSON de eventos (padrão: dados/eventos.json)")
+    comandos = parser.add_subparsers(dest="comando", metavar="comando")
+
+    def periodo(subparser):
+        subparser.add_argument("--since", "--desde", type=ler_data, help="Início do período (inclusivo)")
+        subparser.add_argument("--until", "--ate", type=ler_data, help="Fim do período (exclusivo)")
+
+    add = comandos.add_parser("add", aliases=["adicionar"], help="Adiciona um evento")
+    add.add_argument("nome")
+    add.add_argument("data_hora", type=ler_data, help="AAAA-MM-DDTHH:MM ou 'DD-MM-AAAA HH:MM'")
+    add.set_defaults(funcao=comando_add)
+
+    listar = comandos.add_parser("list", aliases=["listar"], help="Lista os eventos em ordem cronológica")
+    periodo(listar)
+    listar.add_argument("--formato", choices=["texto", "json", "ndjson"], default="texto")
+    listar.set_defaults(funcao=comando_list)
+
+    importar = comandos.add_parser("import", aliases=["importar"], help="Importa eventos de um arquivo JSON ou NDJSON")
+    importar.add_argument("entrada", help="Arquivo a importar ('-' para a entrada padrão)")
+    importar.set_defaults(funcao=comando_import)
+
+    exportar = comandos.add_parser("export", aliases=["exportar"], help="Exporta os eventos")
+    periodo(exportar)
+    exportar.add_argument("--formato", choices=["json", "ndjson"], default="json")
+    exportar.add_argument("--saida", default="-", help="Arquivo de saída ('-' para a saída padrão)")
+    exportar.set_defaults(funcao=comando_export)
+
+    sync = comandos.add_parser("sync", aliases=["sincronizar"], help="Envia os eventos locais para a API em lotes")
+    periodo(sync)
+    sync.add_argument("--api", default=API_URL, help=f"Endereço da API (padrão: {API_URL})")
+    sync.add_argument("--lote", type=int, default=TAMANHO_LOTE_SYNC, help="Eventos por requisição")
+    sync.add_argument("--timeout", type=float, default=60, help="Tempo limite de cada requisição (s)")
+    sync.add_argument("--simular", action="store_true", help="Só mostra o que seria enviado, sem gravar")
+    sync.set_defaults(funcao=comando_sync)
+
+    pull = comandos.add_parser("pull", aliases=["baixar"], help="Baixa da API só o que mudou desde o último pull")
+    pull.add_argument("--api", default=API_URL, help=f"Endereço da API (padrão: {API_URL})")
+    pull.add_argument("--lote", type=int, default=TAMANHO_LOTE_SYNC, help="Mudanças por página (máximo 1000)")
+    pull.add_argument("--timeout", type=float, default=60, help="Tempo limite de cada requisição (s)")
+    pull.set_defaults(funcao=comando_pull)
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    if args.comando is None:
+        menu_principal()
+        return 0
+    try:
+        return args.funcao(args)
+    except BrokenPipeError:
+        # Saída fechada antes do fim (ex.: "| head"); evita o erro ao sair
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+
+
 # Ponto de entrada do programa
 if __name__ == "__main__":
     """
     Este bloco é executado apenas quando o arquivo é executado diretamente,
     não quando é importado como módulo em outro arquivo.
     """
-    menu_principal()
\ No newline at end of file
+    sys.exit(main())
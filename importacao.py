@@ -0,0 +1,174 @@
+"""
+Leitura incremental de arquivos de eventos
+==========================================
+
+Lê arquivos JSON (um array no nível principal) ou NDJSON (um objeto por linha)
+item a item, sem carregar o arquivo inteiro na memória. É usado pela aba de
+importação do frontend e pelo gerenciador de eventos de terminal.
+
+Módulos utilizados:
+- codecs: Para decodificar arquivos binários (UTF-8) em blocos
+- json: Para decodificar cada item com JSONDecoder.raw_decode()
+- datetime: Para validar as datas dos eventos
+"""
+
+import codecs
+import json
+from datetime import datetime
+
+# Quantidade de caracteres lidos do arquivo por vez
+TAMANHO_BLOCO_LEITURA = 64 * 1024
+# Maior item aceito (em caracteres). Um item malformado faria o leitor
+# continuar lendo blocos até o fim do arquivo procurando o final dele
+TAMANHO_MAXIMO_ITEM = 1024 * 1024
+
+_ESPACOS = " \t\r\n"
+_decodificador = json.JSONDecoder()
+
+
+def _ler_blocos(arquivo, tamanho_bloco):
+    """
+    Lê o arquivo em blocos de texto, aceitando arquivos abertos em modo texto
+    ou binário (como o BytesIO retornado pelo st.file_uploader).
+    """
+    decodificador = codecs.getincrementaldecoder("utf-8-sig")()
+    while True:
+        bloco = arquivo.read(tamanho_bloco)
+        if not bloco:
+            resto = decodificador.decode(b"", final=True)
+            if resto:
+                yield resto
+            return
+        if isinstance(bloco, bytes):
+            bloco = decodificador.decode(bloco)
+        if bloco:
+            yield bloco
+
+
+class _Leitor:
+    """Mantém apenas o trecho ainda não consumido do arquivo em memória."""
+
+    def __init__(self, blocos, tamanho_maximo_item=TAMANHO_MAXIMO_ITEM):
+        self.blocos = blocos
+        self.tamanho_maximo_item = tamanho_maximo_item
+        self.buffer = ""
+        self.pos = 0
+        self.fim = False
+
+    def _carregar(self):
+        try:
+            bloco = next(self.blocos)
+        except StopIteration:
+            self.fim = True
+            return False
+        # Descarta o que já foi consumido antes de anexar o novo bloco
+        self.buffer = self.buffer[self.pos:] + bloco
+        self.pos = 0
+        return True
+
+    def proximo_caractere(self):
+        """Retorna o próximo caractere significativo sem consumi-lo ('' no fim do arquivo)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _ESPACOS:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._carregar():
+                return ""
+
+    def consumir(self):
+        self.pos += 1
+
+    def ler_valor(self):
+        """Decodifica o próximo valor JSON, lendo mais blocos enquanto ele estiver incompleto."""
+        self.proximo_caractere()
+        while True:
+            try:
+                valor, fim = _decodificador.raw_decode(self.buffer, self.pos)
+                # Um valor que termina no fim do buffer pode estar cortado (ex.: um número)
+                if fim < len(self.buffer) or self.fim:
+                    self.pos = fim
+                    return valor
+            except json.JSONDecodeError:
+                # Sem o fim do item mesmo com tamanho_maximo_item caracteres no
+                # buffer: o item está malformado (ou é grande demais)
+                if self.fim or len(self.buffer) - self.pos > self.tamanho_maximo_item:
+                    raise
+            self._carregar()
+
+
+def iterar_eventos(arquivo, tamanho_bloco=TAMANHO_BLOCO_LEITURA, tamanho_maximo_item=TAMANHO_MAXIMO_ITEM):
+    """
+    Itera sobre os itens de um arquivo JSON ou NDJSON, um por vez.
+
+    Se o arquivo começar com '[' ele é tratado como um array JSON; caso
+    contrário, como uma sequência de valores JSON (NDJSON).
+    Lança json.JSONDecodeError se o conteúdo estiver malformado ou se um
+    item passar de `tamanho_maximo_item` caracteres.
+    """
+    leitor = _Leitor(_ler_blocos(arquivo, tamanho_bloco), tamanho_maximo_item)
+    caractere = leitor.proximo_caractere()
+
+    if caractere != "[":
+        # NDJSON: valores separados por quebras de linha
+        while leitor.proximo_caractere():
+            yield leitor.ler_valor()
+        return
+
+    leitor.consumir()
+    if leitor.proximo_caractere() == "]":
+        leitor.consumir()
+    else:
+        while True:
+            yield leitor.ler_valor()
+            caractere = leitor.proximo_caractere()
+            leitor.consumir()
+            if caractere == "]":
+                break
+            if caractere != ",":
+                raise json.JSONDecodeError("Esperado ',' ou ']'", leitor.buffer, leitor.pos - 1)
+
+    if leitor.proximo_caractere():
+        raise json.JSONDecodeError("Conteúdo extra após o array", leitor.buffer, leitor.pos)
+
+
+def e_cabecalho_snapshot(item):
+    """
+    Verifica se o item é o cabeçalho ({"geracao": ...}) que abre o snapshot
+    do gerenciador de eventos. Ele identifica o arquivo para o diário e não é
+    um evento: quem importa esse arquivo deve pulá-lo.
+    """
+    return isinstance(item, dict) and item.keys() == {"geracao"}
+
+
+def em_lotes(itens, tamanho):
+    """Agrupa um iterável em listas de no máximo `tamanho` itens."""
+    lote = []
+    for item in itens:
+        lote.append(item)
+        if len(lote) >= tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def normalizar_evento(evento):
+    """
+    Valida um item do arquivo e retorna o evento no formato da API
+    ({"nome", "data_hora"} com a data em ISO). Lança ValueError se for inválido.
+    """
+    if not isinstance(evento, dict):
+        raise ValueError(f"Item não é um objeto: {evento}")
+
+    nome = evento.get("nome", "")
+    data_hora_str = evento.get("data_hora", "")
+    if not nome or not data_hora_str:
+        raise ValueError(f"Evento sem nome ou data: {evento}")
+
+    try:
+        data_obj = datetime.fromisoformat(data_hora_str)
+    except (ValueError, TypeError):
+        raise ValueError(f"Data inválida para '{nome}': {data_hora_str}")
+
+    return {"nome": nome, "data_hora": data_obj.isoformat()}
@@ -0,0 +1,237 @@
+"""
+Métricas da API
+===============
+
+Instrumentação do backend, exposta em /metrics no formato de texto do
+Prometheus:
+
+- MiddlewareMetricas: middleware ASGI que mede a latência de cada requisição
+  (histograma por método e rota), conta as requisições por status e mantém o
+  número de requisições em andamento.
+- instrumentar_engine(): registra eventos do SQLAlchemy que contam as
+  consultas e medem o tempo gasto no banco por requisição.
+- medir_serializacao(): mede o tempo gasto gerando o JSON das respostas.
+- Log de requisições lentas (EVENTOS_LIMITE_LENTO_MS), com o SQL executado.
+
+As métricas ficam na memória do processo; com vários workers do uvicorn, cada
+worker expõe as suas.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# Limites superiores (em segundos) das faixas dos histogramas
+FAIXAS_LATENCIA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAIXAS_CONSULTAS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+# Quantidade máxima de comandos SQL guardados por requisição para o log de lentas
+MAX_SQL_POR_REQUISICAO = 50
+
+log_lentas = logging.getLogger("eventos.lentas")
+
+
+class Histograma:
+    """Histograma cumulativo no formato do Prometheus (faixas fixas)."""
+
+    def __init__(self, faixas):
+        self.faixas = faixas
+        self.contagens = [0] * len(faixas)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.soma += valor
+        self.total += 1
+        for posicao, limite in enumerate(self.faixas):
+            if valor <= limite:
+                self.contagens[posicao] += 1
+                break
+
+    def linhas(self, nome, rotulos):
+        acumulado = 0
+        for limite, contagem in zip(self.faixas, self.contagens):
+            acumulado += contagem
+            yield f'{nome}_bucket{{{rotulos},le="{limite}"}} {acumulado}'
+        yield f'{nome}_bucket{{{rotulos},le="+Inf"}} {self.total}'
+        yield f"{nome}_sum{{{rotulos}}} {self.soma:.6f}"
+        yield f"{nome}_count{{{rotulos}}} {self.total}"
+
+
+class EstadoRequisicao:
+    """Dados coletados durante uma requisição (compartilhados via ContextVar)."""
+
+    __slots__ = ("consultas", "tempo_db", "tempo_serializacao", "sql")
+
+    def __init__(self, guardar_sql):
+        self.consultas = 0
+        self.tempo_db = 0.0
+        self.tempo_serializacao = 0.0
+        self.sql = [] if guardar_sql else None
+
+
+# O estado é um objeto mutável: os endpoints síncronos rodam no threadpool com
+# uma cópia do contexto, mas alteram o mesmo objeto criado pelo middleware
+_estado_atual: ContextVar = ContextVar("estado_requisicao", default=None)
+
+
+class RegistroMetricas:
+    def __init__(self, limite_lento_ms=0):
+        self.limite_lento = limite_lento_ms / 1000
+        self.em_andamento = 0
+        self.requisicoes = {}  # (metodo, rota, status) -> total
+        self.latencia = {}  # (metodo, rota) -> Histograma
+        self.consultas = {}  # (metodo, rota) -> Histograma
+        self.tempo_db = {}  # (metodo, rota) -> Histograma
+        self.serializacao = {}  # (metodo, rota) -> Histograma
+        self.consultas_fora_requisicao = 0
+        self._lock = threading.Lock()
+
+    def _observar(self, tabela, chave, faixas, valor):
+        histograma = tabela.get(chave)
+        if histograma is None:
+            histograma = tabela[chave] = Histograma(faixas)
+        histograma.observar(valor)
+
+    def iniciar(self):
+        with self._lock:
+            self.em_andamento += 1
+        return EstadoRequisicao(guardar_sql=self.limite_lento > 0)
+
+    def finalizar(self, metodo, rota, status, duracao, estado):
+        chave = (metodo, rota)
+        with self._lock:
+            self.em_andamento -= 1
+            chave_status = (metodo, rota, status)
+            self.requisicoes[chave_status] = self.requisicoes.get(chave_status, 0) + 1
+            self._observar(self.latencia, chave, FAIXAS_LATENCIA, duracao)
+            self._observar(self.consultas, chave, FAIXAS_CONSULTAS, estado.consultas)
+            self._observar(self.tempo_db, chave, FAIXAS_LATENCIA, estado.tempo_db)
+            if estado.tempo_serializacao:
+                self._observar(self.serializacao, chave, FAIXAS_LATENCIA, estado.tempo_serializacao)
+
+    def registrar_consulta_fora_requisicao(self):
+        with self._lock:
+            self.consultas_fora_requisicao += 1
+
+    def texto_prometheus(self, medidores=()):
+        """Gera o texto do /metrics; `medidores` são tuplas extras (nome, tipo, ajuda, valor)."""
+        linhas = []
+
+        def cabecalho(nome, tipo, ajuda):
+            linhas.append(f"# HELP {nome} {ajuda}")
+            linhas.append(f"# TYPE {nome} {tipo}")
+
+        def histogramas(nome, ajuda, tabela):
+            cabecalho(nome, "histogram", ajuda)
+            for (metodo, rota), histograma in sorted(tabela.items()):
+                linhas.extend(histograma.linhas(nome, f'metodo="{metodo}",rota="{rota}"'))
+
+        with self._lock:
+            cabecalho("eventos_requisicoes_total", "counter", "Requisições atendidas por método, rota e status.")
+            for (metodo, rota, status), total in sorted(self.requisicoes.items()):
+                linhas.append(f'eventos_requisicoes_total{{metodo="{metodo}",rota="{rota}",status="{status}"}} {total}')
+            cabecalho("eventos_requisicoes_em_andamento", "gauge", "Requisições sendo processadas agora.")
+            linhas.append(f"eventos_requisicoes_em_andamento {self.em_andamento}")
+            histogramas("eventos_requisicao_segundos", "Latência das requisições.", self.latencia)
+            histogramas("eventos_db_consultas", "Consultas SQL executadas por requisição.", self.consultas)
+            histogramas("eventos_db_segundos", "Tempo gasto no banco por requisição.", self.tempo_db)
+            histogramas("eventos_serializacao_segundos", "Tempo gerando o JSON da resposta.", self.serializacao)
+            cabecalho("eventos_db_consultas_fora_requisicao_total", "counter",
+                      "Consultas SQL executadas fora de uma requisição (ex.: criação das tabelas).")
+            linhas.append(f"eventos_db_consultas_fora_requisicao_total {self.consultas_fora_requisicao}")
+
+        for nome, tipo, ajuda, valor in medidores:
+            cabecalho(nome, tipo, ajuda)
+            linhas.append(f"{nome} {valor}")
+        return "\n".join(linhas) + "\n"
+
+
+class MiddlewareMetricas:
+    """Middleware ASGI (sem BaseHTTPMiddleware, para não custar uma task extra por requisição)."""
+
+    def __init__(self, app, registro):
+        self.app = app
+        self.registro = registro
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registro = self.registro
+        estado = registro.iniciar()
+        token = _estado_atual.set(estado)
+        status = 500
+        inicio = time.perf_counter()
+
+        async def enviar(mensagem):
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            duracao = time.perf_counter() - inicio
+            _estado_atual.reset(token)
+            # O roteador do FastAPI grava a rota encontrada no scope; usar o
+            # modelo do caminho (/eventos/{evento_id}) mantém poucas séries
+            rota = getattr(scope.get("route"), "path", "<sem rota>")
+            registro.finalizar(scope["method"], rota, status, duracao, estado)
+            if registro.limite_lento and duracao >= registro.limite_lento:
+                registrar_lenta(scope, status, duracao, estado)
+
+
+def registrar_lenta(scope, status, duracao, estado):
+    comandos = "\n".join(f"  {sql}" for sql in estado.sql)
+    log_lentas.warning(
+        "Requisição lenta: %s %s -> %s em %.1f ms (%d consultas, %.1f ms no banco, %.1f ms serializando)\n%s",
+        scope["method"], scope["path"], status, duracao * 1000, estado.consultas,
+        estado.tempo_db * 1000, estado.tempo_serializacao * 1000, comandos,
+    )
+
+
+def instrumentar_engine(engine, registro):
+    """Conta as consultas e mede o tempo de cada uma (engine síncrona ou .sync_engine da assíncrona)."""
+
+    def antes(conexao, _cursor, _sql, _parametros, _contexto, _executemany):
+        conexao.info.setdefault("inicio_consultas", []).append(time.perf_counter())
+
+    def depois(conexao, _cursor, sql, _parametros, _contexto, _executemany):
+        duracao = time.perf_counter() - conexao.info["inicio_consultas"].pop()
+        estado = _estado_atual.get()
+        if estado is None:
+            registro.registrar_consulta_fora_requisicao()
+            return
+        estado.consultas += 1
+        estado.tempo_db += duracao
+        if estado.sql is not None and len(estado.sql) < MAX_SQL_POR_REQUISICAO:
+            estado.sql.append(f"[{duracao * 1000:.1f} ms] {' '.join(sql.split())}")
+
+    def erro(contexto):
+        # Consulta que falhou não passa por after_cursor_execute
+        if contexto.connection is not None:
+            inicios = contexto.connection.info.get("inicio_consultas")
+            if inicios:
+                inicios.pop()
+
+    event.listen(engine, "before_cursor_execute", antes)
+    event.listen(engine, "after_cursor_execute", depois)
+    event.listen(engine, "handle_error", erro)
+
+
+@contextmanager
+def medir_serializacao():
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        estado = _estado_atual.get()
+        if estado is not None:
+            estado.tempo_serializacao += time.perf_counter() - inicio
@@ -0,0 +1,110 @@
+"""
+Eventos recorrentes
+===================
+
+Regras de repetição no estilo RRULE (diária, semanal ou mensal, a cada
+`intervalo` unidades, terminando numa data ou após um número de ocorrências).
+
+Uma série é guardada uma única vez no banco; as ocorrências são calculadas
+sob demanda e só dentro do intervalo consultado. A k-ésima ocorrência é obtida
+diretamente (sem percorrer as anteriores), então tanto listar quanto contar as
+ocorrências de um período custa apenas o que cai dentro dele.
+
+As funções recebem qualquer objeto com os atributos `inicio`, `frequencia`,
+`intervalo` e `contagem` (como o modelo SerieEvento do backend).
+"""
+
+import calendar
+from datetime import datetime, timedelta
+
+FREQUENCIAS = ("diaria", "semanal", "mensal")
+
+# Limite de ocorrências por série (ex.: ~27 anos de ocorrências diárias)
+MAX_OCORRENCIAS = 10000
+
+_DIAS_POR_PASSO = {"diaria": 1, "semanal": 7}
+
+
+def ocorrencia(inicio: datetime, frequencia: str, intervalo: int, k: int) -> datetime:
+    """Data/hora da k-ésima ocorrência (a primeira é k=0).
+
+    Na repetição mensal, um dia que não existe no mês (ex.: 31 em abril) vira o
+    último dia do mês.
+    """
+    if frequencia == "mensal":
+        meses = inicio.month - 1 + k * intervalo
+        ano, mes = inicio.year + meses // 12, meses % 12 + 1
+        dia = min(inicio.day, calendar.monthrange(ano, mes)[1])
+        return inicio.replace(year=ano, month=mes, day=dia)
+    return inicio + timedelta(days=_DIAS_POR_PASSO[frequencia] * intervalo * k)
+
+
+def _ocorrencia_limitada(inicio: datetime, frequencia: str, intervalo: int, k: int) -> datetime:
+    """Como ocorrencia(), mas datetime.max para ocorrências depois do ano 9999."""
+    try:
+        return ocorrencia(inicio, frequencia, intervalo, k)
+    except (OverflowError, ValueError):
+        return datetime.max
+
+
+def primeiro_indice(inicio: datetime, frequencia: str, intervalo: int, data_hora: datetime) -> int:
+    """Menor k com ocorrencia(k) >= data_hora (pode passar do total da série)."""
+    if data_hora <= inicio:
+        return 0
+    if frequencia == "mensal":
+        meses = (data_hora.year - inicio.year) * 12 + data_hora.month - inicio.month
+        k = max(0, meses // intervalo)
+    else:
+        passo = timedelta(days=_DIAS_POR_PASSO[frequencia] * intervalo)
+        k = (data_hora - inicio) // passo
+    # A estimativa erra por no máximo uma ocorrência; ajusta nos dois sentidos
+    while k > 0 and _ocorrencia_limitada(inicio, frequencia, intervalo, k - 1) >= data_hora:
+        k -= 1
+    while _ocorrencia_limitada(inicio, frequencia, intervalo, k) < data_hora:
+        k += 1
+    return k
+
+
+def total_ocorrencias(inicio: datetime, frequencia: str, intervalo: int,
+                      ate: datetime = None, contagem: int = None) -> int:
+    """Quantidade de ocorrências da série: `contagem` ou as que caem até `ate` (inclusivo).
+
+    Levanta ValueError se a série passar de MAX_OCORRENCIAS ocorrências ou
+    se a última ocorrência cair depois do ano 9999.
+    """
+    if contagem is None and ate is not None and _ocorrencia_limitada(inicio, frequencia, intervalo, MAX_OCORRENCIAS) <= ate:
+        raise ValueError(f"A série teria mais de {MAX_OCORRENCIAS} ocorrências; use uma data final mais próxima")
+    total = contagem if contagem is not None else MAX_OCORRENCIAS
+    if ate is not None:
+        ate_exclusivo = primeiro_indice(inicio, frequencia, intervalo, ate)
+        if _ocorrencia_limitada(inicio, frequencia, intervalo, ate_exclusivo) == ate:
+            ate_exclusivo += 1
+        total = min(total, ate_exclusivo)
+    if _ocorrencia_limitada(inicio, frequencia, intervalo, total - 1) == datetime.max:
+        raise ValueError("A série termina depois do ano 9999")
+    return total
+
+
+def _indices(serie, inicio=None, fim=None):
+    primeiro = primeiro_indice(serie.inicio, serie.frequencia, serie.intervalo, inicio) if inicio else 0
+    ultimo = serie.contagem
+    if fim is not None:
+        ultimo = min(ultimo, primeiro_indice(serie.inicio, serie.frequencia, serie.intervalo, fim))
+    return primeiro, ultimo
+
+
+def expandir(serie, inicio: datetime = None, fim: datetime = None):
+    """Gera as ocorrências da série com inicio <= data_hora < fim, em ordem."""
+    primeiro, ultimo = _indices(serie, inicio, fim)
+    for k in range(primeiro, ultimo):
+        yield ocorrencia(serie.inicio, serie.frequencia, serie.intervalo, k)
+
+
+def contar(serie, inicio: datetime = None, fim: datetime = None) -> int:
+    """Quantidade de ocorrências com inicio <= data_hora < fim, sem gerá-las."""
+    primeiro, ultimo = _indices(serie, inicio, fim)
+    return max(0, ultimo - primeiro)
+
+
+def ultima_ocorrencia(serie):
+    return ocorrencia(serie.inicio, serie.frequencia, serie.intervalo, serie.contagem - 1)
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+
+# O backend só abre conexões quando usado; estes testes não tocam no banco
+os.environ.setdefault("EVENTOS_DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'eventos_testes.db')}")
+
+import backend  # noqa: E402
+
+
+def evento(evento_id, data_hora):
+    return SimpleNamespace(id=evento_id, nome=f"Evento {evento_id}", data_hora=data_hora)
+
+
+def serie(serie_id, inicio, contagem, frequencia="diaria"):
+    return SimpleNamespace(id=serie_id, nome=f"Série {serie_id}", inicio=inicio, frequencia=frequencia,
+                           intervalo=1, contagem=contagem)
+
+
+class TestCursor(unittest.TestCase):
+    def test_ida_e_volta(self):
+        data_hora = datetime(2025, 3, 1, 14, 30)
+        for chave in (42, -7):
+            cursor = backend.codificar_cursor(data_hora, chave)
+            self.assertEqual(backend.decodificar_cursor(cursor), (data_hora, chave))
+
+    def test_cursor_invalido(self):
+        for cursor in ("???", "bm9wZQ==", backend.codificar_cursor_mudancas(1, 2)):
+            with self.subTest(cursor=cursor), self.assertRaises(ValueError):
+                backend.decodificar_cursor(cursor)
+
+    def test_cursor_de_mudancas(self):
+        cursor = backend.codificar_cursor_mudancas(15, -3)
+        self.assertEqual(backend.decodificar_cursor_mudancas(cursor), (15, -3))
+        with self.assertRaises(ValueError):
+            backend.decodificar_cursor_mudancas("???")
+
+
+class TestMesclarSeries(unittest.TestCase):
+    def setUp(self):
+        self.eventos = [evento(1, datetime(2025, 1, 1, 9)), evento(2, datetime(2025, 1, 2, 9)),
+                        evento(3, datetime(2025, 1, 3, 12))]
+        self.series = [serie(1, datetime(2025, 1, 1, 9), contagem=3), serie(2, datetime(2025, 1, 2, 10), contagem=2)]
+
+    def chaves(self, itens):
+        return [backend.chave_ordenacao(item) for item in itens]
+
+    def test_ordem_cronologica_com_desempate_pela_chave(self):
+        itens = backend.mesclar_series(self.eventos, self.series)
+        self.assertEqual(self.chaves(itens), [
+            (datetime(2025, 1, 1, 9), -1), (datetime(2025, 1, 1, 9), 1),
+            (datetime(2025, 1, 2, 9), -1), (datetime(2025, 1, 2, 9), 2),
+            (datetime(2025, 1, 2, 10), -2), (datetime(2025, 1, 3, 9), -1),
+            (datetime(2025, 1, 3, 10), -2), (datetime(2025, 1, 3, 12), 3),
+        ])
+        self.assertEqual([item.serie_id for item in itens if item.id is None], [1, 1, 2, 1, 2])
+
+    def test_paginas_pelo_cursor_cobrem_tudo(self):
+        completo = self.chaves(backend.mesclar_series(self.eventos, self.series))
+        paginas, apos = [], None
+        while True:
+            eventos = [item for item in self.eventos if apos is None or backend.chave_ordenacao(item) > apos]
+            pagina = backend.mesclar_series(eventos, self.series, apos=apos, limite=3)
+            if not pagina:
+                break
+            paginas.extend(self.chaves(pagina))
+            apos = backend.decodificar_cursor(backend.codificar_cursor(*backend.chave_ordenacao(pagina[-1])))
+        self.assertEqual(paginas, completo)
+
+    def test_intervalo_com_fim_exclusivo(self):
+        itens = backend.mesclar_series(self.eventos[1:2], self.series, datetime(2025, 1, 2), datetime(2025, 1, 3, 9))
+        self.assertEqual(self.chaves(itens), [
+            (datetime(2025, 1, 2, 9), -1), (datetime(2025, 1, 2, 9), 2), (datetime(2025, 1, 2, 10), -2),
+        ])
+
+    def test_sem_series(self):
+        self.assertEqual(backend.mesclar_series(self.eventos, [], limite=2), self.eventos[:2])
+
+
+if __name__ == "__main__":
+    unittest.main()
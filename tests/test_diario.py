@@ -0,0 +1,133 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import gerenciador_eventos
+from gerenciador_eventos import ArmazemEventos, DiarioEventos
+
+
+def evento(nome, dia):
+    return {"nome": nome, "data_hora": datetime(2025, 1, dia, 10).isoformat()}
+
+
+class TestDiarioEventos(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.pasta)
+        self.caminho = os.path.join(self.pasta, "eventos.json")
+        # Avisos e mensagens de compactação vão para stderr
+        silencio = contextlib.redirect_stderr(io.StringIO())
+        silencio.__enter__()
+        self.addCleanup(silencio.__exit__, None, None, None)
+
+    def abrir(self):
+        diario = DiarioEventos(self.caminho)
+        return diario, ArmazemEventos.de_dicionarios(diario.carregar())
+
+    def nomes(self):
+        _, eventos = self.abrir()
+        return [registro.nome for registro in eventos]
+
+    def registrar(self, diario, eventos, nome, dia):
+        item = evento(nome, dia)
+        eventos.adicionar(item["nome"], datetime.fromisoformat(item["data_hora"]))
+        diario.registrar(item)
+
+    def linhas_diario(self):
+        with open(self.caminho[:-len(".json")] + ".jsonl", encoding="utf-8") as arquivo:
+            return [json.loads(linha) for linha in arquivo]
+
+    def test_sem_arquivos(self):
+        diario, eventos = self.abrir()
+        self.assertEqual(len(eventos), 0)
+        self.assertIsNone(diario.geracao)
+
+    def test_diario_reaplicado_sobre_o_snapshot(self):
+        diario, eventos = self.abrir()
+        self.registrar(diario, eventos, "a", 1)
+        diario.compactar(eventos)
+        self.registrar(diario, eventos, "b", 2)
+        self.registrar(diario, eventos, "c", 3)
+        self.assertEqual(self.linhas_diario()[0], {"geracao": diario.geracao})
+        self.assertEqual(self.nomes(), ["a", "b", "c"])
+        diario, _ = self.abrir()
+        self.assertEqual(diario.entradas, 2)
+
+    def test_diario_novo_tem_cabecalho(self):
+        diario, eventos = self.abrir()
+        self.registrar(diario, eventos, "a", 1)
+        self.assertEqual(self.linhas_diario(), [{"geracao": None}, evento("a", 1)])
+        self.assertEqual(self.nomes(), ["a"])
+
+    def test_ultima_linha_incompleta(self):
+        diario, eventos = self.abrir()
+        self.registrar(diario, eventos, "a", 1)
+        self.registrar(diario, eventos, "b", 2)
+        with open(diario.caminho_diario, "a", encoding="utf-8") as arquivo:
+            arquivo.write('{"nome": "c", "data_')
+        self.assertEqual(self.nomes(), ["a", "b"])
+        # O trecho incompleto foi removido: o próximo registro começa numa linha nova
+        diario, eventos = self.abrir()
+        self.registrar(diario, eventos, "d", 4)
+        self.assertEqual(self.nomes(), ["a", "b", "d"])
+
+    def test_linha_invalida_no_meio(self):
+        diario, eventos = self.abrir()
+        self.registrar(diario, eventos, "a", 1)
+        with open(diario.caminho_diario, "a", encoding="utf-8") as arquivo:
+            arquivo.write("lixo\n")
+        self.registrar(diario, eventos, "b", 2)
+        self.assertEqual(self.nomes(), ["a", "b"])
+
+    def test_geracao_diferente_ignora_o_diario(self):
+        diario, eventos = self.abrir()
+        self.registrar(diario, eventos, "a", 1)
+        diario.compactar(eventos)
+        self.registrar(diario, eventos, "b", 2)
+        # Compactação interrompida entre a troca do snapshot e a do diário, com
+        # o mesmo número de eventos (um removido e outro incluído, como no pull)
+        eventos.aplicar([("b", datetime(2025, 1, 2, 10))], [("c", datetime(2025, 1, 3, 10))])
+        substituir = os.replace
+
+        def falhar_no_diario(origem, destino):
+            if destino == diario.caminho_diario:
+                raise KeyboardInterrupt
+            substituir(origem, destino)
+
+        with mock.patch.object(gerenciador_eventos.os, "replace", falhar_no_diario), \
+                self.assertRaises(KeyboardInterrupt):
+            diario.compactar(eventos)
+        self.assertEqual(self.nomes(), ["a", "c"])
+        # O diário antigo foi descartado; os próximos registros valem para o snapshot novo
+        diario, eventos = self.abrir()
+        self.registrar(diario, eventos, "d", 4)
+        self.assertEqual(self.nomes(), ["a", "c", "d"])
+
+    def test_cabecalho_antigo_com_contagem(self):
+        with open(self.caminho, "w", encoding="utf-8") as arquivo:
+            json.dump([evento("a", 1)], arquivo)
+        caminho_diario = self.caminho[:-len(".json")] + ".jsonl"
+        with open(caminho_diario, "w", encoding="utf-8") as arquivo:
+            arquivo.write(json.dumps({"snapshot": 1}) + "\n" + json.dumps(evento("b", 2)) + "\n")
+        self.assertEqual(self.nomes(), ["a", "b"])
+        with open(caminho_diario, "w", encoding="utf-8") as arquivo:
+            arquivo.write(json.dumps({"snapshot": 5}) + "\n" + json.dumps(evento("b", 2)) + "\n")
+        self.assertEqual(self.nomes(), ["a"])
+
+    def test_snapshot_comeca_com_a_geracao(self):
+        diario, eventos = self.abrir()
+        self.registrar(diario, eventos, "a", 1)
+        diario.compactar(eventos)
+        with open(self.caminho, encoding="utf-8") as arquivo:
+            self.assertEqual(json.load(arquivo), [{"geracao": diario.geracao}, evento("a", 1)])
+        self.assertEqual(self.linhas_diario(), [{"geracao": diario.geracao}])
+
+
+if __name__ == "__main__":
+    unittest.main()
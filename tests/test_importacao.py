@@ -0,0 +1,103 @@
+import io
+import json
+import unittest
+
+from importacao import e_cabecalho_snapshot, em_lotes, iterar_eventos, normalizar_evento
+
+EVENTOS = [{"nome": f"Evento {i}", "data_hora": f"2025-01-{i + 1:02d}T10:00:00"} for i in range(20)]
+
+
+def ler(conteudo, **opcoes):
+    arquivo = io.BytesIO(conteudo.encode("utf-8")) if isinstance(conteudo, str) else io.BytesIO(conteudo)
+    return list(iterar_eventos(arquivo, **opcoes))
+
+
+class TestIterarEventos(unittest.TestCase):
+    def test_array_e_ndjson(self):
+        self.assertEqual(ler(json.dumps(EVENTOS, indent=2)), EVENTOS)
+        self.assertEqual(ler("\n".join(json.dumps(evento) for evento in EVENTOS) + "\n"), EVENTOS)
+
+    def test_vazios(self):
+        self.assertEqual(ler("[]"), [])
+        self.assertEqual(ler("  [ \n ]  "), [])
+        self.assertEqual(ler(""), [])
+
+    def test_qualquer_tamanho_de_bloco(self):
+        # Itens, strings e números cortados no meio de um bloco
+        conteudo = json.dumps(EVENTOS + [12345678, "texto com , e ]"], ensure_ascii=False)
+        for tamanho_bloco in (1, 2, 3, 7, 64, len(conteudo)):
+            with self.subTest(tamanho_bloco=tamanho_bloco):
+                self.assertEqual(ler(conteudo, tamanho_bloco=tamanho_bloco), EVENTOS + [12345678, "texto com , e ]"])
+
+    def test_utf8_cortado_entre_blocos(self):
+        eventos = [{"nome": "Reunião ação 📅", "data_hora": "2025-01-01T10:00:00"}]
+        conteudo = json.dumps(eventos, ensure_ascii=False).encode("utf-8")
+        for tamanho_bloco in (1, 2, 5):
+            with self.subTest(tamanho_bloco=tamanho_bloco):
+                self.assertEqual(ler(conteudo, tamanho_bloco=tamanho_bloco), eventos)
+
+    def test_bom(self):
+        conteudo = "\ufeff" + json.dumps(EVENTOS[:2])
+        self.assertEqual(ler(conteudo), EVENTOS[:2])
+        self.assertEqual(ler(conteudo, tamanho_bloco=1), EVENTOS[:2])
+        # Arquivo aberto em modo texto, como o snapshot lido pelo gerenciador
+        self.assertEqual(list(iterar_eventos(io.StringIO(json.dumps(EVENTOS[:2])))), EVENTOS[:2])
+
+    def test_entrada_truncada(self):
+        conteudo = json.dumps(EVENTOS)
+        for corte in (len(conteudo) - 1, len(conteudo) // 2, 1):
+            with self.subTest(corte=corte), self.assertRaises(json.JSONDecodeError):
+                ler(conteudo[:corte], tamanho_bloco=16)
+        with self.assertRaises(json.JSONDecodeError):
+            ler('{"nome": "a"}\n{"nome": ')
+
+    def test_itens_lidos_antes_do_erro(self):
+        itens = []
+        with self.assertRaises(json.JSONDecodeError):
+            for item in iterar_eventos(io.StringIO(json.dumps(EVENTOS[:3])[:-20]), tamanho_bloco=8):
+                itens.append(item)
+        self.assertEqual(itens, EVENTOS[:2])
+
+    def test_separador_e_conteudo_extra(self):
+        with self.assertRaises(json.JSONDecodeError):
+            ler('[{"a": 1} {"b": 2}]')
+        with self.assertRaises(json.JSONDecodeError):
+            ler('[{"a": 1}] lixo')
+
+    def test_item_grande_demais(self):
+        # Um item malformado não faz o leitor carregar o arquivo inteiro
+        leituras = []
+
+        class Arquivo(io.StringIO):
+            def read(self, tamanho=-1):
+                leituras.append(tamanho)
+                return super().read(tamanho)
+
+        conteudo = '[{"nome": "' + "x" * 10_000
+        with self.assertRaises(json.JSONDecodeError):
+            list(iterar_eventos(Arquivo(conteudo), tamanho_bloco=100, tamanho_maximo_item=500))
+        self.assertLess(len(leituras), 10)
+
+
+class TestAuxiliares(unittest.TestCase):
+    def test_em_lotes(self):
+        self.assertEqual(list(em_lotes(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(em_lotes([], 3)), [])
+
+    def test_normalizar_evento(self):
+        self.assertEqual(
+            normalizar_evento({"nome": "a", "data_hora": "2025-01-01T10:00", "extra": 1}),
+            {"nome": "a", "data_hora": "2025-01-01T10:00:00"},
+        )
+        for invalido in ([], {"nome": "a"}, {"nome": "a", "data_hora": "ontem"}):
+            with self.subTest(item=invalido), self.assertRaises(ValueError):
+                normalizar_evento(invalido)
+
+    def test_cabecalho_snapshot(self):
+        self.assertTrue(e_cabecalho_snapshot({"geracao": "abc"}))
+        self.assertFalse(e_cabecalho_snapshot({"geracao": "abc", "nome": "a"}))
+        self.assertFalse(e_cabecalho_snapshot(EVENTOS[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import recorrencia
+
+
+def serie(inicio, frequencia, intervalo=1, contagem=10):
+    return SimpleNamespace(inicio=inicio, frequencia=frequencia, intervalo=intervalo, contagem=contagem)
+
+
+class TestOcorrencia(unittest.TestCase):
+    def test_diaria_e_semanal(self):
+        inicio = datetime(2025, 1, 1, 9, 0)
+        self.assertEqual(recorrencia.ocorrencia(inicio, "diaria", 2, 3), datetime(2025, 1, 7, 9, 0))
+        self.assertEqual(recorrencia.ocorrencia(inicio, "semanal", 1, 2), datetime(2025, 1, 15, 9, 0))
+
+    def test_mensal_limita_ao_ultimo_dia_do_mes(self):
+        inicio = datetime(2024, 1, 31, 18, 30)
+        datas = [recorrencia.ocorrencia(inicio, "mensal", 1, k) for k in range(4)]
+        self.assertEqual(datas, [
+            datetime(2024, 1, 31, 18, 30),
+            datetime(2024, 2, 29, 18, 30),  # ano bissexto
+            datetime(2024, 3, 31, 18, 30),  # volta ao dia 31, não fica no 29
+            datetime(2024, 4, 30, 18, 30),
+        ])
+        self.assertEqual(recorrencia.ocorrencia(inicio, "mensal", 13, 1), datetime(2025, 2, 28, 18, 30))
+
+    def test_mensal_atravessa_o_ano(self):
+        self.assertEqual(recorrencia.ocorrencia(datetime(2025, 11, 15), "mensal", 3, 1), datetime(2026, 2, 15))
+
+
+class TestPrimeiroIndice(unittest.TestCase):
+    def test_limites(self):
+        inicio = datetime(2025, 1, 31)
+        for frequencia, intervalo in [("diaria", 1), ("diaria", 3), ("semanal", 2), ("mensal", 1), ("mensal", 5)]:
+            for k in range(40):
+                data = recorrencia.ocorrencia(inicio, frequencia, intervalo, k)
+                with self.subTest(frequencia=frequencia, intervalo=intervalo, k=k):
+                    self.assertEqual(recorrencia.primeiro_indice(inicio, frequencia, intervalo, data), k)
+                    self.assertEqual(
+                        recorrencia.primeiro_indice(inicio, frequencia, intervalo, data + timedelta(seconds=1)), k + 1
+                    )
+
+    def test_antes_do_inicio(self):
+        self.assertEqual(recorrencia.primeiro_indice(datetime(2025, 1, 1), "diaria", 1, datetime(2020, 1, 1)), 0)
+
+
+class TestExpandirEContar(unittest.TestCase):
+    def test_fim_exclusivo(self):
+        s = serie(datetime(2025, 1, 1, 10), "diaria", contagem=5)
+        datas = list(recorrencia.expandir(s, datetime(2025, 1, 2, 10), datetime(2025, 1, 4, 10)))
+        self.assertEqual(datas, [datetime(2025, 1, 2, 10), datetime(2025, 1, 3, 10)])
+
+    def test_respeita_a_contagem(self):
+        s = serie(datetime(2025, 1, 1), "semanal", contagem=3)
+        self.assertEqual(len(list(recorrencia.expandir(s))), 3)
+        self.assertEqual(list(recorrencia.expandir(s, datetime(2025, 2, 1))), [])
+        self.assertEqual(recorrencia.ultima_ocorrencia(s), datetime(2025, 1, 15))
+
+    def test_contar_igual_a_expandir(self):
+        s = serie(datetime(2024, 1, 31, 8), "mensal", intervalo=1, contagem=30)
+        janelas = [(None, None), (datetime(2024, 2, 1), None), (None, datetime(2024, 6, 30, 8)),
+                   (datetime(2024, 2, 29, 8), datetime(2024, 3, 1)), (datetime(2030, 1, 1), None),
+                   (datetime(2024, 5, 1), datetime(2024, 4, 1))]
+        for inicio, fim in janelas:
+            with self.subTest(inicio=inicio, fim=fim):
+                self.assertEqual(recorrencia.contar(s, inicio, fim), len(list(recorrencia.expandir(s, inicio, fim))))
+
+
+class TestTotalOcorrencias(unittest.TestCase):
+    def test_contagem(self):
+        self.assertEqual(recorrencia.total_ocorrencias(datetime(2025, 1, 1), "diaria", 1, contagem=7), 7)
+
+    def test_ate_inclusivo(self):
+        inicio = datetime(2025, 1, 1, 9)
+        self.assertEqual(recorrencia.total_ocorrencias(inicio, "diaria", 1, ate=datetime(2025, 1, 5, 9)), 5)
+        self.assertEqual(recorrencia.total_ocorrencias(inicio, "diaria", 1, ate=datetime(2025, 1, 5, 8, 59)), 4)
+
+    def test_menor_entre_ate_e_contagem(self):
+        inicio = datetime(2025, 1, 1)
+        self.assertEqual(recorrencia.total_ocorrencias(inicio, "diaria", 1, ate=datetime(2025, 1, 10), contagem=3), 3)
+
+    def test_limite_de_ocorrencias(self):
+        inicio = datetime(2000, 1, 1)
+        ultima = recorrencia.ocorrencia(inicio, "diaria", 1, recorrencia.MAX_OCORRENCIAS - 1)
+        self.assertEqual(recorrencia.total_ocorrencias(inicio, "diaria", 1, ate=ultima), recorrencia.MAX_OCORRENCIAS)
+        with self.assertRaises(ValueError):
+            recorrencia.total_ocorrencias(inicio, "diaria", 1, ate=ultima + timedelta(days=1))
+
+    def test_depois_do_ano_9999(self):
+        with self.assertRaises(ValueError):
+            recorrencia.total_ocorrencias(datetime(9999, 6, 1), "mensal", 1, contagem=12)
+        self.assertEqual(recorrencia.total_ocorrencias(datetime(9999, 6, 1), "mensal", 1, contagem=7), 7)
+        self.assertEqual(
+            recorrencia.total_ocorrencias(datetime(9999, 12, 1), "diaria", 1000, ate=datetime(9999, 12, 31)), 1
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()